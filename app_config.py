@@ -1,5 +1,5 @@
-from typing import Dict
-from dataclasses import dataclass
+from typing import Dict, List
+from dataclasses import dataclass, field
 
 @dataclass
 class AppConfig:
@@ -10,10 +10,23 @@ class AppConfig:
     nt_to_volt: float = 1.0 / 100000  # 1V = 10,000nT
     interval: float = 60.0  # 每 60 秒輸出一次
     log_flush_interval: int = 10  # 每處理10筆數據寫入一次日誌
+    checkpoint_interval: int = 5  # 每輸出5筆數據更新一次檢查點
+    max_open_files: int = 2  # 多檔播放時同時保留在記憶體中的檔案數
+    monitor_max_error_nt: float = 5000.0  # 量測與指令磁場差距超過此值即警示
+    monitor_z_threshold: float = 6.0  # 誤差偏離平均值超過幾個標準差即警示
+    monitor_stuck_steps: int = 2  # 指令改變但量測值連續幾筆不變視為卡住
+    monitor_saturation_volts: float = 9.8  # 類比輸入超過此電壓視為飽和
+    monitor_auto_pause: bool = False  # 發生異常時自動暫停輸出
+    monitor_relearn_steps: int = 5  # 誤差突變連續幾筆後以新的誤差水準重新學習基準
+    follow_latency: float = 2.0  # 追蹤模式下資料依時間戳記延遲幾秒輸出（吸收寫入端抖動）
+    follow_window: int = 10000  # 追蹤模式下保留在記憶體中的筆數
+    follow_poll_interval: float = 0.5  # 無 inotify 時檢查檔案的間隔（秒）
+    transforms: List[Dict] = field(default_factory=list)  # 輸出前的轉換流程，見 transform_pipeline.py
 
     @classmethod
     def from_dict(cls, config_dict: Dict) -> 'AppConfig':
-        return cls(**{k: config_dict.get(k, v) for k, v in cls.__dataclass_fields__.items()})
+        # 只傳入設定檔中有的欄位，其餘使用預設值（舊設定檔缺少新欄位時）
+        return cls(**{k: config_dict[k] for k in cls.__dataclass_fields__ if k in config_dict})
 
     def to_dict(self) -> Dict:
         return self.__dict__
@@ -0,0 +1,76 @@
+import json
+import os
+import traceback
+from typing import Dict, Optional
+
+
+def write_json_atomic(path: str, data):
+    """先寫入暫存檔並 fsync，再以 os.replace 取代，確保檔案不會只寫一半；失敗時拋出例外"""
+    tmp_path = path + ".tmp"
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class CheckpointManager:
+    """將輸出進度寫入小型狀態檔，供程式中斷後以 --resume 快速恢復"""
+
+    def __init__(self, path: str, checkpoint_interval: int = 5):
+        self.path = path
+        self.checkpoint_interval = checkpoint_interval
+
+    @staticmethod
+    def file_identity(file_path: str) -> Dict:
+        """以路徑、大小與修改時間識別資料檔，不需重新讀取內容"""
+        stat = os.stat(file_path)
+        return {
+            "path": os.path.abspath(file_path),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+        }
+
+    @staticmethod
+    def matches_file(identity: Dict, file_path: str) -> bool:
+        try:
+            return CheckpointManager.file_identity(file_path) == identity
+        except OSError:
+            return False
+
+    def save(self, checkpoint: Dict) -> bool:
+        try:
+            write_json_atomic(self.path, checkpoint)
+            return True
+        except Exception as e:
+            print(f"寫入檢查點失敗: {e}")
+            traceback.print_exc()
+            return False
+
+    def load(self) -> Optional[Dict]:
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"讀取檢查點失敗: {e}")
+            return None
+
+    def clear(self):
+        try:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+        except OSError as e:
+            print(f"刪除檢查點失敗: {e}")
+
+    def should_checkpoint(self, counter: int) -> bool:
+        return counter % self.checkpoint_interval == 0
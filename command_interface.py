@@ -1,19 +1,20 @@
-try:
-    import readline
-except ImportError:
-    import pyreadline3 as readline
 from typing import Callable, Dict
 
 class CommandInterface:
     def __init__(self):
         self.commands: Dict[str, Callable] = {}
-        self._setup_command_completion()
         
     def register_command(self, command: str, handler: Callable, help_text: str = ""):
         """註冊一個指令及其處理器"""
         self.commands[command] = {"handler": handler, "help": help_text}
         
     def _setup_command_completion(self):
+        # readline 僅在進入互動模式時才需要，延後匯入以加快啟動
+        try:
+            import readline
+        except ImportError:
+            import pyreadline3 as readline
+
         def completer(text, state):
             options = [cmd for cmd in self.commands.keys() if cmd.startswith(text)]
             return options[state] if state < len(options) else None
@@ -41,6 +42,10 @@ class CommandInterface:
         print("未知指令，輸入 help 查看可用指令。")
         return True
         
+    def notify(self, message: str):
+        """由輸出執行緒顯示警示訊息"""
+        print(f"\n[警示] {message}")
+
     def show_help(self) -> bool:
         """顯示所有已註冊指令的幫助信息"""
         print("可用指令：")
@@ -50,6 +55,7 @@ class CommandInterface:
         
     def start_interactive_loop(self, prompt: str = ">> "):
         """開始交互命令循環"""
+        self._setup_command_completion()
         print("輸入指令（輸入 help 查看指令列表）")
         
         try:
@@ -1,10 +1,22 @@
-import nidaqmx
-from nidaqmx.constants import TerminalConfiguration, AcquisitionType, RegenerationMode
-from nidaqmx.stream_writers import AnalogMultiChannelWriter
 import traceback
-import numpy as np
 from typing import List
 
+# nidaqmx 與 numpy 匯入耗時，於 initialize() 時才載入，讓主程式能先顯示選單
+nidaqmx = None
+np = None
+AnalogMultiChannelWriter = None
+
+def _import_daq_modules():
+    global nidaqmx, np, AnalogMultiChannelWriter
+    if nidaqmx is None:
+        import numpy
+        import nidaqmx as _nidaqmx
+        import nidaqmx.system
+        from nidaqmx.stream_writers import AnalogMultiChannelWriter as _writer
+        np = numpy
+        AnalogMultiChannelWriter = _writer
+        nidaqmx = _nidaqmx
+
 class DAQController:
     def __init__(self, device_name: str, channels: dict[str, List[str]], sample_rate: int = 1000, buffer_size: int = 1000):
         self.device_name = device_name
@@ -25,6 +37,9 @@ class DAQController:
 
     def initialize(self) -> bool:
         try:
+            _import_daq_modules()
+            from nidaqmx.constants import TerminalConfiguration, AcquisitionType, RegenerationMode
+
             system = nidaqmx.system.System.local()
             if self.device_name not in system.devices:
                 print(f"錯誤：找不到DAQ設備 {self.device_name}")
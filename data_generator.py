@@ -0,0 +1,207 @@
+import argparse
+import os
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from testing_data import calibration_steps
+
+PROFILES = ("steps", "ramps", "sweep", "noise", "storm", "calibration")
+FORMATS = ("csv", "txt")
+DEFAULT_BASELINE = (20000.0, 0.0, 40000.0)  # 典型中緯度地磁場 (nT)
+CALIBRATION_SCALE = 100000.0  # testing_data 的單位為伏特，乘上 1/nt_to_volt 換成 nT
+# 一天內每一秒的 HH:MM:SS 字串，以查表取代逐筆格式化時間
+TIME_OF_DAY = np.array([f"{h:02d}:{m:02d}:{s:02d}" for h in range(24) for m in range(60) for s in range(60)])
+MILLISECONDS = np.array([f".{ms:03d}" for ms in range(1000)])
+MIN_PERIOD = 0.001  # 時間精度為毫秒，更短的間隔會產生重複的時間
+
+
+class FieldGenerator:
+    """分塊產生合成的三軸磁場資料
+
+    多個 profile 會疊加在 baseline 上（calibration 除外，為絕對值）。
+    每個 profile 使用由 seed 衍生的獨立亂數流，並在區塊之間保留狀態，
+    因此相同的 seed 與參數會產生相同的資料，與分塊大小無關。
+    """
+
+    def __init__(self, profiles: Sequence[str], seed: int = 0, period: float = 1.0,
+                 baseline: Sequence[float] = DEFAULT_BASELINE, step_rows: int = 600,
+                 ramp_period: float = 3600.0, sweep_period: float = 3600.0,
+                 sweep_band: Sequence[float] = (1e-3, 0.1), noise_std: float = 2.0,
+                 storm_every: float = 5 * 86400.0, hold_rows: int = 60):
+        unknown = set(profiles) - set(PROFILES)
+        if unknown:
+            raise ValueError(f"未知的 profile: {', '.join(sorted(unknown))}")
+        if "calibration" in profiles and len(profiles) > 1:
+            raise ValueError("calibration 不可與其他 profile 疊加")
+        self.profiles = list(profiles)
+        self.seed = seed
+        self.rngs = {profile: np.random.default_rng(child)
+                     for profile, child in zip(PROFILES, np.random.SeedSequence(seed).spawn(len(PROFILES)))}
+        self.period = period
+        self.baseline = np.asarray(baseline, dtype=float)
+        self.step_rows = step_rows
+        self.ramp_period = ramp_period
+        self.sweep_period = sweep_period
+        self.sweep_band = sweep_band
+        self.noise_std = noise_std
+        self.storm_every = storm_every
+        self.hold_rows = hold_rows
+        self.calibration = np.asarray(calibration_steps(), dtype=float) * CALIBRATION_SCALE
+        # 跨區塊保留的狀態
+        self._step_segment = -1
+        self._step_level = np.zeros(3)
+        self._walk = np.zeros(3)
+
+    def generate(self, start_row: int, rows: int) -> np.ndarray:
+        """產生第 start_row 起的 rows 筆資料，形狀為 (rows, 3)，需依序呼叫"""
+        index = np.arange(start_row, start_row + rows)
+        t = index * self.period
+        if self.profiles == ["calibration"]:
+            return self.calibration[(index // self.hold_rows) % len(self.calibration)]
+        field = np.broadcast_to(self.baseline, (rows, 3)).copy()
+        for profile in self.profiles:
+            field += getattr(self, f"_{profile}")(index, t)
+        return field
+
+    def _steps(self, index: np.ndarray, t: np.ndarray) -> np.ndarray:
+        segment = index // self.step_rows
+        first, last = int(segment[0]), int(segment[-1])
+        # 與上一個區塊相接的階梯沿用原本的強度，只為新的階梯抽亂數
+        continued = first == self._step_segment
+        new_levels = self.rngs["steps"].uniform(-5000.0, 5000.0, size=(last - first + 1 - continued, 3))
+        levels = np.vstack([self._step_level[None, :], new_levels]) if continued else new_levels
+        self._step_segment, self._step_level = last, levels[-1]
+        return levels[segment - first]
+
+    def _ramps(self, index: np.ndarray, t: np.ndarray) -> np.ndarray:
+        # 三角波，各軸相位錯開
+        phase = t[:, None] / self.ramp_period + np.array([0.0, 1 / 3, 2 / 3])
+        return 2000.0 * (4 * np.abs(phase - np.floor(phase + 0.5)) - 1)
+
+    def _sweep(self, index: np.ndarray, t: np.ndarray) -> np.ndarray:
+        # 對數頻率掃描，每個 sweep_period 重複一次
+        f0, f1 = self.sweep_band
+        k = np.log(f1 / f0)
+        tau = np.mod(t, self.sweep_period)
+        phase = 2 * np.pi * f0 * self.sweep_period / k * (np.exp(k * tau / self.sweep_period) - 1)
+        return 500.0 * np.sin(phase[:, None] + np.array([0.0, np.pi / 2, np.pi]))
+
+    def _noise(self, index: np.ndarray, t: np.ndarray) -> np.ndarray:
+        # 白雜訊加上隨機漫步，模擬儀器雜訊與緩慢漂移
+        rng = self.rngs["noise"]
+        steps = rng.normal(0.0, 1.0, size=(len(index), 2, 3))
+        white = self.noise_std * steps[:, 0]
+        walk = self._walk + np.cumsum(self.noise_std * 0.05 * steps[:, 1], axis=0)
+        self._walk = walk[-1]
+        return white + walk
+
+    def _storm(self, index: np.ndarray, t: np.ndarray) -> np.ndarray:
+        """磁暴：急始 (SSC) 上升、主相下降數小時，再以指數恢復"""
+        result = np.zeros((len(t), 3))
+        first = int(t[0] // self.storm_every)
+        last = int(t[-1] // self.storm_every)
+        # 前一個週期的磁暴可能仍在恢復相
+        for storm in range(max(first - 1, 0), last + 1):
+            storm_rng = np.random.default_rng([self.seed, storm])
+            onset = storm * self.storm_every + storm_rng.uniform(0.2, 0.6) * self.storm_every
+            depth = storm_rng.uniform(50.0, 400.0)
+            ssc = storm_rng.uniform(10.0, 50.0)
+            main_phase = storm_rng.uniform(3, 12) * 3600.0
+            recovery = storm_rng.uniform(12, 48) * 3600.0
+            dt = t - onset
+            active = dt >= 0
+            if not active.any():
+                continue
+            d = dt[active]
+            h = ssc * np.exp(-d / 1800.0) - depth * np.where(
+                d < main_phase, d / main_phase, np.exp(-(d - main_phase) / recovery))
+            ripple = 0.1 * depth * np.sin(2 * np.pi * d / 600.0) * np.exp(-d / (main_phase + recovery))
+            result[active, 0] += h
+            result[active, 1] += ripple
+            result[active, 2] -= 0.3 * h
+        return result
+
+
+def _time_columns(start: datetime, index: np.ndarray, period: float, fmt: str,
+                  fractional: bool = False) -> Dict[str, np.ndarray]:
+    """fractional 為 True 時時間包含毫秒（HH:MM:SS.fff），用於非整數秒的取樣間隔"""
+    offsets = np.round(index * period * 1000).astype(np.int64).astype('timedelta64[ms]')
+    times_ms = np.datetime64(start, 'ms') + offsets
+    times = times_ms.astype('datetime64[s]')
+    days = times.astype('datetime64[D]')
+    # 一個區塊只涵蓋少數幾天，日期只需對不重複的日子格式化
+    unique_days, inverse = np.unique(days, return_inverse=True)
+    day_text = pd.Series(np.datetime_as_string(unique_days))
+    time_text = TIME_OF_DAY[(times - days).astype(np.int64)]
+    if fractional:
+        time_text = np.char.add(time_text, MILLISECONDS[(times_ms - times).astype(np.int64)])
+    if fmt == "txt":
+        return {"Time": (day_text + 'T').to_numpy()[inverse] + pd.Series(time_text)}
+    return {
+        "year": day_text.str.slice(0, 4).to_numpy()[inverse],
+        "month": day_text.str.slice(5, 7).to_numpy()[inverse],
+        "day": day_text.str.slice(8, 10).to_numpy()[inverse],
+        "time": time_text,
+    }
+
+
+def write_file(file_path: str, generator: FieldGenerator, rows: int, fmt: str = "csv",
+               start: Optional[datetime] = None, chunksize: int = 500000):
+    """分塊寫入資料檔，記憶體用量只與 chunksize 有關
+
+    csv: DataLoader 讀取的格式（兩行標頭，逗號分隔，年,月,日,時間,Bx,By,Bz）
+    txt: 空白分隔格式（標頭 Time Bx By Bz）
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"未知的檔案格式: {fmt}")
+    if generator.period < MIN_PERIOD:
+        raise ValueError(f"取樣間隔不可小於 {MIN_PERIOD} 秒")
+    start = start or datetime(2024, 1, 1)
+    # 間隔或起始時間不是整數秒時輸出毫秒，避免時間重複
+    fractional = not float(generator.period).is_integer() or start.microsecond != 0
+    with open(file_path, 'w', encoding='utf-8', newline='') as f:
+        if fmt == "csv":
+            f.write(f"# synthetic field data, profiles={'+'.join(generator.profiles)}, seed={generator.seed}\n")
+            f.write("year,month,day,time,Bx,By,Bz\n")
+        else:
+            f.write("Time Bx By Bz\n")
+        for chunk_start in range(0, rows, chunksize):
+            n = min(chunksize, rows - chunk_start)
+            index = np.arange(chunk_start, chunk_start + n)
+            field = generator.generate(chunk_start, n)
+            df = pd.DataFrame(_time_columns(start, index, generator.period, fmt, fractional))
+            # 先四捨五入再輸出，比 float_format 逐格格式化快
+            field = field.round(3)
+            df["Bx"], df["By"], df["Bz"] = field[:, 0], field[:, 1], field[:, 2]
+            df.to_csv(f, sep=',' if fmt == "csv" else ' ', header=False, index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="產生合成磁場資料，用於壓力測試與校準")
+    parser.add_argument("output", help="輸出檔案路徑")
+    parser.add_argument("--rows", type=int, default=1000000, help="資料筆數")
+    parser.add_argument("--profile", default="storm+noise",
+                        help=f"以 + 疊加的 profile：{', '.join(PROFILES)}")
+    parser.add_argument("--format", choices=FORMATS, default="csv", help="輸出格式")
+    parser.add_argument("--seed", type=int, default=0, help="亂數種子")
+    parser.add_argument("--period", type=float, default=1.0, help="取樣間隔（秒）")
+    parser.add_argument("--start", default="2024-01-01T00:00:00", help="第一筆資料的時間 (ISO 格式)")
+    parser.add_argument("--chunksize", type=int, default=500000, help="每次寫入的列數")
+    parser.add_argument("--hold", type=int, default=60, help="calibration 每個階梯維持的筆數")
+    args = parser.parse_args()
+    if args.period < MIN_PERIOD:
+        parser.error(f"--period 不可小於 {MIN_PERIOD} 秒")
+
+    profiles: List[str] = args.profile.split('+')
+    generator = FieldGenerator(profiles, seed=args.seed, period=args.period, hold_rows=args.hold)
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    print(f"產生 {args.rows} 筆資料 ({args.profile}) 至 {args.output}...")
+    write_file(args.output, generator, args.rows, args.format, datetime.fromisoformat(args.start), args.chunksize)
+    print("完成")
+
+
+if __name__ == "__main__":
+    main()
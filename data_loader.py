@@ -1,12 +1,128 @@
-import pandas as pd
+import threading
 import traceback
-from typing import Optional
+from concurrent.futures import Future
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# 兩種資料格式的標頭列數
+COMMA_FORMAT = "comma"            # 兩行標頭，逗號分隔：年,月,日,時間,Bx,By,Bz
+WHITESPACE_FORMAT = "whitespace"  # 一行標頭，空白分隔：Time Bx By Bz
+HEADER_ROWS = {COMMA_FORMAT: 2, WHITESPACE_FORMAT: 1}
+
+
+def detect_format(file_path: str) -> str:
+    """依檔案開頭判斷格式：第二、三行含逗號時為逗號分隔格式"""
+    with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+        lines = [line for line in (f.readline() for _ in range(3)) if line.strip()]
+    sample = lines[1:] or lines
+    return COMMA_FORMAT if sample and ',' in sample[-1] else WHITESPACE_FORMAT
+
+
+def split_fields(line: str) -> Tuple[str, List[str]]:
+    """將一行資料拆成 (時間字串, [Bx, By, Bz] 字串)，依該行是否含逗號判斷格式"""
+    if ',' in line:
+        fields = [field.strip() for field in line.split(',')]
+        return ' '.join(fields[:4]), fields[4:7]
+    fields = line.split()
+    return (fields[0] if fields else ''), fields[1:4]
+
+
+def parse_time(text: str) -> Optional[float]:
+    """將資料的時間字串轉為 epoch 秒（無時區時視為 UTC），無法解析時回傳 None
+
+    支援 ISO 格式（2024-01-15T12:00:00）與「年 月 日 時[:分[:秒]]」（2024 01 15 12 或 2024 1 15 12:30:00）
+    """
+    text = text.strip()
+    try:
+        if '-' in text[:10]:
+            dt = datetime.fromisoformat(text)
+        else:
+            year, month, day, clock = text.split()[:4]
+            hours, minutes, seconds = ([float(part) for part in clock.split(':')] + [0.0, 0.0])[:3]
+            dt = datetime(int(year), int(month), int(day)) + timedelta(hours=hours, minutes=minutes, seconds=seconds)
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+class RowIndexer:
+    """以 iloc[row] 呼叫資料集的 row(row)，讓自訂資料集可直接取代 output_loop 使用的 DataFrame"""
+
+    def __init__(self, row: Callable[[int], Any]):
+        self._row = row
+
+    def __getitem__(self, row: int):
+        return self._row(row)
+
+
+class PartialFrame:
+    """從檔案中段開始載入的資料，以全域列號存取；first_row 之前的資料未載入"""
+
+    def __init__(self, frame: 'pd.DataFrame', first_row: int):
+        self.frame = frame
+        self.first_row = first_row
+        self.iloc = RowIndexer(self.row)
+
+    def __len__(self) -> int:
+        return self.first_row + len(self.frame)
+
+    def row(self, row: int):
+        if row < self.first_row:
+            raise IndexError(f"只載入了第 {self.first_row} 行之後的資料")
+        return self.frame.iloc[row - self.first_row]
+
+
+class RowOffsetTracker:
+    """記錄資料列在檔案中的位元組位置，讓檢查點可記錄恢復時的讀取起點
+
+    列號遞增時從上次的位置繼續掃描，只有往回跳行時才從檔案開頭重新掃描。
+    """
+
+    def __init__(self, file_path: str, start: Optional[Dict] = None):
+        self.file_path = file_path
+        self._lock = threading.Lock()
+        self._row, self._offset = (start["row"], start["offset"]) if start else (0, None)
+
+    def _first_row_offset(self) -> int:
+        with open(self.file_path, 'rb') as f:
+            for _ in range(HEADER_ROWS[detect_format(self.file_path)]):
+                f.readline()
+            return f.tell()
+
+    def offset(self, row: int) -> int:
+        """第 row 筆資料的起始位元組位置（與 DataLoader 相同，略過標頭與空白行）"""
+        with self._lock:
+            if self._offset is None or row < self._row:
+                self._row, self._offset = 0, self._first_row_offset()
+            with open(self.file_path, 'rb') as f:
+                f.seek(self._offset)
+                while self._row < row:
+                    line = f.readline()
+                    if not line:
+                        raise IndexError(f"行數 {row} 超出檔案範圍")
+                    if line.strip():
+                        self._row += 1
+                        self._offset = f.tell()
+            return self._offset
+
 
 class DataLoader:
     @staticmethod
-    def load_data(file_path: str) -> Optional[pd.DataFrame]:
-        def first_format(file_path: str) -> pd.DataFrame:
-            df = pd.read_csv(file_path, delim_whitespace=True, skiprows=0)
+    def load_data(file_path: str, start_offset: Optional[int] = None) -> Optional['pd.DataFrame']:
+        """載入資料檔；指定 start_offset 時從該位元組位置（某一筆資料的開頭）讀到檔尾"""
+        # pandas 載入較慢，延後到真正需要讀檔時才匯入
+        import pandas as pd
+
+        def first_format(source, has_header: bool = True) -> pd.DataFrame:
+            if has_header:
+                df = pd.read_csv(source, sep=r'\s+', skiprows=HEADER_ROWS[WHITESPACE_FORMAT] - 1)
+            else:
+                df = pd.read_csv(source, sep=r'\s+', header=None)
             
             if len(df.columns) < 4:
                 raise ValueError("數據文件需要至少4列 (時間, Bx, By, Bz)")
@@ -18,8 +134,8 @@ class DataLoader:
             })
             return df
         
-        def second_format(file_path: str) -> pd.DataFrame:
-            df = pd.read_csv(file_path,header=None, skiprows=2)
+        def second_format(source, skiprows: int = HEADER_ROWS[COMMA_FORMAT]) -> pd.DataFrame:
+            df = pd.read_csv(source,header=None, skiprows=skiprows)
             
             if len(df.columns) < 4:
                 raise ValueError("數據文件需要至少4列 (時間, Bx, By, Bz)")
@@ -32,7 +148,13 @@ class DataLoader:
             
         try:
             print(f"載入磁場資料中: {file_path}...")
-            df = second_format(file_path)
+            comma = detect_format(file_path) == COMMA_FORMAT
+            if start_offset is None:
+                df = second_format(file_path) if comma else first_format(file_path)
+            else:
+                with open(file_path, 'rb') as f:
+                    f.seek(start_offset)
+                    df = second_format(f, skiprows=0) if comma else first_format(f, has_header=False)
 
             print(f"資料筆數：{len(df)}")
             return df
@@ -44,3 +166,42 @@ class DataLoader:
             print(f"載入資料時發生錯誤: {e}")
             traceback.print_exc()
         return None
+
+    @staticmethod
+    def find_time_row(df: 'pd.DataFrame', epoch: float) -> int:
+        """二分搜尋第一筆時間不早於 epoch（秒）的列號，資料需依時間排序；晚於所有資料時回傳 len(df)"""
+        times = df['Time']
+        low, high = 0, len(df)
+        while low < high:
+            mid = (low + high) // 2
+            value = parse_time(str(times.iloc[mid]))
+            if value is None:
+                raise ValueError(f"無法解析第 {mid} 行的時間：{times.iloc[mid]}")
+            if value < epoch:
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    @staticmethod
+    def preload(file_path: str, transform: Optional[Callable[['pd.DataFrame'], 'pd.DataFrame']] = None,
+                start: Optional[Dict] = None) -> Future:
+        """在背景執行緒載入資料，回傳 Future，結果與 load_data 相同；指定 transform 時一併於背景套用
+
+        start 為 {"row", "offset"} 時只讀取該筆之後的資料，結果為以全域列號存取的 PartialFrame。
+        """
+        future: Future = Future()
+
+        def worker():
+            try:
+                df = DataLoader.load_data(file_path, start["offset"] if start else None)
+                if df is not None and transform is not None:
+                    df = transform(df)
+                if df is not None and start:
+                    df = PartialFrame(df, start["row"])
+                future.set_result(df)
+            except BaseException as e:
+                future.set_exception(e)
+
+        threading.Thread(target=worker, daemon=True).start()
+        return future
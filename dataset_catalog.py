@@ -0,0 +1,165 @@
+import bisect
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Tuple
+
+from checkpoint_manager import CheckpointManager, write_json_atomic
+from data_loader import DataLoader, HEADER_ROWS, RowIndexer, detect_format, parse_time, split_fields
+
+CATALOG_FILENAME = ".catalog.json"
+
+
+class DatasetCatalog:
+    """掃描資料夾內每個檔案的時間範圍與筆數，結果保存於索引檔，只重新掃描有變更的檔案"""
+
+    def __init__(self, folder: str):
+        self.folder = folder
+        self.path = os.path.join(folder, CATALOG_FILENAME)
+
+    @staticmethod
+    def _time_text(line: bytes) -> str:
+        return split_fields(line.decode('utf-8', errors='replace'))[0]
+
+    @staticmethod
+    def _scan(file_path: str) -> Dict:
+        """逐行掃描計算筆數，並取出第一筆與最後一筆的時間，不需解析整份資料"""
+        rows = 0
+        first = last = b""
+        # 標頭列數與 DataLoader 讀檔時略過的列數相同
+        header_rows = HEADER_ROWS[detect_format(file_path)]
+        with open(file_path, 'rb') as f:
+            for i, line in enumerate(f):
+                if i < header_rows or not line.strip():
+                    continue
+                if rows == 0:
+                    first = line
+                last = line
+                rows += 1
+        start = DatasetCatalog._time_text(first) if rows else ""
+        end = DatasetCatalog._time_text(last) if rows else ""
+        return {
+            "rows": rows,
+            "start": start,
+            "end": end,
+            "start_epoch": parse_time(start),
+            "end_epoch": parse_time(end),
+        }
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self, entries: Dict[str, Dict]):
+        try:
+            write_json_atomic(self.path, entries)
+        except OSError as e:
+            print(f"寫入資料索引失敗: {e}")
+
+    def refresh(self) -> List[Dict]:
+        """回傳依檔名排序的檔案資訊（name, rows, start, end, start_epoch, end_epoch, identity）"""
+        cached = self._load()
+        entries = {}
+        for name in sorted(os.listdir(self.folder)):
+            file_path = os.path.join(self.folder, name)
+            if name.startswith('.') or not os.path.isfile(file_path):
+                continue
+            identity = CheckpointManager.file_identity(file_path)
+            entry = cached.get(name)
+            # 舊版索引沒有 epoch 時間，同樣重新掃描
+            if entry is None or entry.get("identity") != identity or "end_epoch" not in entry:
+                entry = {**self._scan(file_path), "identity": identity}
+            entries[name] = entry
+        if entries != cached:
+            self._save(entries)
+        return [{"name": name, **entry} for name, entry in entries.items()]
+
+
+class VirtualDataset:
+    """將多個檔案視為一份連續資料
+
+    以全域列號存取，或以 row_at 依時間找出列號；依需要載入對應的檔案，並預先載入下一個檔案；
+    最多同時保留 max_open_files 個檔案，超過時淘汰最久未使用的檔案。
+    支援 len() 與 iloc[row]，可直接取代 output_loop 使用的 DataFrame。
+    """
+
+    def __init__(self, folder: str, entries: List[Dict], max_open_files: int = 2):
+        self.paths = [os.path.join(folder, entry["name"]) for entry in entries]
+        self.entries = entries
+        self.max_open_files = max(1, max_open_files)
+        self.offsets: List[int] = []
+        total = 0
+        for entry in entries:
+            self.offsets.append(total)
+            total += entry["rows"]
+        self._total = total
+        self._cache: 'OrderedDict[int, Future]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.iloc = RowIndexer(self.row)
+
+    def __len__(self) -> int:
+        return self._total
+
+    def locate(self, row: int) -> Tuple[int, int]:
+        """全域列號 -> (檔案編號, 檔案內列號)"""
+        if row < 0 or row >= self._total:
+            raise IndexError(f"行數 {row} 超出範圍")
+        file_index = bisect.bisect_right(self.offsets, row) - 1
+        return file_index, row - self.offsets[file_index]
+
+    def next_file_row(self, row: int) -> Optional[int]:
+        """row 所在檔案之後的下一個檔案的第一筆列號；已是最後一個檔案時回傳 None"""
+        file_index, _ = self.locate(row)
+        return self.offsets[file_index + 1] if file_index + 1 < len(self.offsets) else None
+
+    def row_at(self, epoch: float) -> int:
+        """第一筆時間不早於 epoch（秒）的全域列號；晚於所有資料時回傳 len()
+
+        先以索引檔的時間範圍找出檔案，只在時間落於檔案內時才載入該檔案搜尋。
+        """
+        ends = [entry.get("end_epoch") for entry in self.entries]
+        if any(end is None for end in ends):
+            raise ValueError("部分資料檔的時間無法解析，無法依時間跳轉")
+        file_index = bisect.bisect_left(ends, epoch)
+        if file_index == len(ends):
+            return self._total
+        if epoch <= self.entries[file_index]["start_epoch"]:
+            return self.offsets[file_index]
+        frame = self._request(file_index).result()
+        if frame is None:
+            raise ValueError(f"載入資料檔失敗：{self.paths[file_index]}")
+        return self.offsets[file_index] + DataLoader.find_time_row(frame, epoch)
+
+    def _request(self, file_index: int) -> Future:
+        with self._lock:
+            future = self._cache.get(file_index)
+            if future is None:
+                future = DataLoader.preload(self.paths[file_index])
+                self._cache[file_index] = future
+                while len(self._cache) > self.max_open_files:
+                    self._cache.popitem(last=False)
+            else:
+                self._cache.move_to_end(file_index)
+            return future
+
+    def row(self, row: int):
+        file_index, local_row = self.locate(row)
+        frame = self._request(file_index).result()
+        if frame is None:
+            raise ValueError(f"載入資料檔失敗：{self.paths[file_index]}")
+        if local_row >= len(frame):
+            raise IndexError(f"{self.entries[file_index]['name']} 只有 {len(frame)} 筆資料，與索引記錄的 "
+                             f"{self.entries[file_index]['rows']} 筆不符")
+        # 預先於背景載入下一個檔案，換檔時不必等待解析
+        if self.max_open_files > 1 and file_index + 1 < len(self.paths):
+            with self._lock:
+                prefetched = file_index + 1 in self._cache
+            if not prefetched:
+                self._request(file_index + 1)
+                self._request(file_index)  # 保持目前檔案為最近使用
+        return frame.iloc[local_row]
@@ -0,0 +1,127 @@
+import math
+from collections import deque
+from datetime import datetime
+from typing import Deque, Dict, List, Sequence, Set
+
+AXES = ('x', 'y', 'z')
+ANALOG_TO_NT = 10000.0  # analog / 10 * 100000，與 output_loop 顯示的量測值相同
+
+
+class _AxisMonitor:
+    __slots__ = ('mean', 'var', 'count', 'shifted', 'last_measured', 'last_commanded', 'stuck', 'active')
+
+    def __init__(self):
+        self.mean = 0.0
+        self.var = 0.0
+        self.count = 0
+        self.shifted = 0
+        self.last_measured = None
+        self.last_commanded = None
+        self.stuck = 0
+        self.active: Set[str] = set()
+
+
+class FieldMonitor:
+    """逐筆檢查量測磁場與指令磁場，每軸只保留固定數量的統計值
+
+    - 誤差：|量測 - 指令| 超過 max_error_nt，或誤差相對於 EWMA 平均值超過 z_threshold 個標準差
+    - 卡住：指令持續改變但量測值連續 stuck_steps 筆幾乎不變
+    - 飽和：類比輸入接近 saturation_volts
+    只在異常開始時回報一次，異常消失後才會再次回報。
+    誤差突變連續 relearn_steps 筆時視為誤差水準已改變（例如增益些微不符時切換到新的指令），
+    以目前的誤差重新建立基準，避免同一個偏移永遠被當成異常。
+    """
+
+    def __init__(self, max_error_nt: float = 5000.0, z_threshold: float = 6.0, alpha: float = 0.1,
+                 warmup: int = 10, stuck_steps: int = 2, stuck_tolerance_nt: float = 1.0,
+                 saturation_volts: float = 9.8, history: int = 20, relearn_steps: int = 5):
+        self.max_error_nt = max_error_nt
+        self.z_threshold = z_threshold
+        self.alpha = alpha
+        self.warmup = warmup
+        self.stuck_steps = stuck_steps
+        self.stuck_tolerance_nt = stuck_tolerance_nt
+        self.saturation_volts = saturation_volts
+        self.relearn_steps = relearn_steps
+        self.axes = [_AxisMonitor() for _ in AXES]
+        self.alert_count = 0
+        self.recent_alerts: Deque[str] = deque(maxlen=history)
+
+    def update(self, commanded: Sequence[float], analog: Sequence[float]) -> List[str]:
+        """加入一筆資料，回傳新出現的異常訊息"""
+        alerts = []
+        for i in range(min(len(commanded), len(analog), len(AXES))):
+            axis = self.axes[i]
+            target = commanded[i]
+            raw = analog[i]
+            measured = raw * ANALOG_TO_NT
+            error = measured - target
+            issues = set()
+
+            if abs(raw) >= self.saturation_volts:
+                issues.add("飽和")
+
+            if abs(error) > self.max_error_nt:
+                issues.add("誤差過大")
+            elif axis.count >= self.warmup:
+                deviation = error - axis.mean
+                if deviation * deviation > self.z_threshold * self.z_threshold * max(axis.var, 1e-12):
+                    issues.add("誤差突變")
+
+            if axis.last_measured is not None:
+                if (abs(measured - axis.last_measured) <= self.stuck_tolerance_nt
+                        and abs(target - axis.last_commanded) > self.stuck_tolerance_nt):
+                    axis.stuck += 1
+                else:
+                    axis.stuck = 0
+                if axis.stuck >= self.stuck_steps:
+                    issues.add("讀值卡住")
+            axis.last_measured = measured
+            axis.last_commanded = target
+
+            axis.shifted = axis.shifted + 1 if issues == {"誤差突變"} else 0
+            if axis.shifted >= self.relearn_steps:
+                # 誤差水準已穩定在新的值，重新開始學習基準（暖機期間不檢查突變）
+                axis.count = 0
+                axis.shifted = 0
+                issues.discard("誤差突變")
+
+            # 異常樣本不納入基準，避免故障被平均值吸收
+            if not issues:
+                if axis.count == 0:
+                    axis.var = 0.0
+                    axis.mean = error
+                else:
+                    diff = error - axis.mean
+                    incr = self.alpha * diff
+                    axis.mean += incr
+                    axis.var = (1 - self.alpha) * (axis.var + diff * incr)
+                axis.count += 1
+
+            new_issues = issues - axis.active
+            axis.active = issues
+            if new_issues:
+                alerts.append(f"{AXES[i].upper()} 軸{'、'.join(sorted(new_issues))}："
+                              f"指令 {target:.1f} nT，量測 {measured:.1f} nT")
+
+        if alerts:
+            now = datetime.now().replace(microsecond=0).isoformat()
+            self.alert_count += len(alerts)
+            self.recent_alerts.extend(f"[{now}] {alert}" for alert in alerts)
+        return alerts
+
+    def clear_alerts(self):
+        """清除目前的異常狀態並重新學習誤差基準，持續存在的異常會在下一筆資料再次回報"""
+        for axis in self.axes:
+            axis.active = set()
+            axis.stuck = 0
+            axis.count = 0
+            axis.shifted = 0
+
+    @property
+    def active_alerts(self) -> Dict[str, Set[str]]:
+        return {AXES[i]: set(axis.active) for i, axis in enumerate(self.axes) if axis.active}
+
+    def axis_stats(self) -> Dict[str, Dict[str, float]]:
+        return {AXES[i]: {"bias": axis.mean, "std": math.sqrt(axis.var), "count": axis.count}
+                for i, axis in enumerate(self.axes)}
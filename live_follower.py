@@ -0,0 +1,226 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import threading
+import time
+import traceback
+from collections import deque, namedtuple
+from typing import Deque, List, Optional, Tuple
+
+from data_loader import RowIndexer, parse_time, split_fields
+
+LiveRow = namedtuple('LiveRow', ['Time', 'Bx', 'By', 'Bz'])
+
+# inotify 事件旗標（<sys/inotify.h>）
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVE_SELF = 0x00000800
+IN_DELETE_SELF = 0x00000400
+IN_NONBLOCK = 0o4000
+
+READ_BLOCK_SIZE = 64 * 1024  # 每次最多讀取的位元組數，避免一次載入大量新增資料
+MAX_LINE_BYTES = 1024 * 1024  # 超過此長度仍未換行的資料視為損壞並丟棄
+
+
+def parse_line(line: str) -> Optional[LiveRow]:
+    """解析一行資料，支援 DataLoader 的兩種格式；標頭或無法解析的行回傳 None
+
+    逗號分隔：前四欄為時間，接著為 Bx, By, Bz
+    空白分隔：第一欄為時間，接著為 Bx, By, Bz
+    """
+    time_text, values = split_fields(line)
+    if len(values) < 3:
+        return None
+    try:
+        return LiveRow(time_text, float(values[0]), float(values[1]), float(values[2]))
+    except ValueError:
+        return None
+
+
+class LiveDataset:
+    """持續增長的資料，只保留最近 window 筆
+
+    列號為自開始追蹤以來的全域編號，len() 為目前已收到的總筆數。
+    輸出時間依資料本身的時間戳記排定：第一筆在收到 latency 秒後輸出，
+    之後每筆對齊同一條時間軸（錨點 + 與錨點資料的時間差），
+    因此寫入端的時間抖動在 latency 內都會被吸收，一次新增的多筆資料也依原本的間隔輸出。
+    資料晚於排定時間才到達（延遲超過 latency，或時間倒退）時，以該筆重新建立錨點。
+    """
+
+    def __init__(self, window: int = 10000, latency: float = 2.0):
+        self.latency = latency
+        self._rows: Deque[LiveRow] = deque(maxlen=window)
+        self._arrivals: Deque[float] = deque(maxlen=window)
+        self._dues: Deque[Optional[float]] = deque(maxlen=window)
+        self._anchor: Optional[Tuple[float, float]] = None  # (輸出時間 perf_counter, 資料時間 epoch)
+        self._total = 0
+        self._lock = threading.Lock()
+        self.iloc = RowIndexer(self.row)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._total
+
+    @property
+    def oldest_row(self) -> int:
+        with self._lock:
+            return self._total - len(self._rows)
+
+    def append(self, rows: List[LiveRow]):
+        arrival = time.perf_counter()
+        with self._lock:
+            for row in rows:
+                self._dues.append(self._schedule(row, arrival))
+            self._rows.extend(rows)
+            self._arrivals.extend([arrival] * len(rows))
+            self._total += len(rows)
+
+    def restart_timeline(self):
+        """資料來源被替換時呼叫，下一筆資料重新建立時間軸錨點"""
+        with self._lock:
+            self._anchor = None
+
+    def _schedule(self, row: LiveRow, arrival: float) -> Optional[float]:
+        epoch = parse_time(row.Time)
+        if epoch is None:
+            return None
+        if self._anchor is not None:
+            anchor_due, anchor_epoch = self._anchor
+            due = anchor_due + (epoch - anchor_epoch)
+            if due >= arrival:
+                return due
+        self._anchor = (arrival + self.latency, epoch)
+        return arrival + self.latency
+
+    def row(self, row: int) -> LiveRow:
+        with self._lock:
+            offset = row - (self._total - len(self._rows))
+            if offset < 0 or row >= self._total:
+                raise IndexError(f"行數 {row} 不在保留範圍內")
+            return self._rows[offset]
+
+    def due(self, row: int) -> Optional[float]:
+        """該筆資料排定的輸出時間 (time.perf_counter())；沒有可解析的時間戳記、尚未收到或已淘汰時回傳 None"""
+        with self._lock:
+            offset = row - (self._total - len(self._rows))
+            if offset < 0 or row >= self._total:
+                return None
+            return self._dues[offset]
+
+    def arrival(self, row: int) -> Optional[float]:
+        """該筆資料的到達時間 (time.perf_counter())；尚未收到時回傳 None，已淘汰時回傳最舊一筆的時間"""
+        with self._lock:
+            if row >= self._total:
+                return None
+            offset = max(row - (self._total - len(self._rows)), 0)
+            return self._arrivals[offset]
+
+
+class _InotifyWatcher:
+    def __init__(self, path: str):
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self.fd = libc.inotify_init1(IN_NONBLOCK)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 失敗")
+        mask = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVE_SELF | IN_DELETE_SELF
+        if libc.inotify_add_watch(self.fd, os.fsencode(path), mask) < 0:
+            os.close(self.fd)
+            raise OSError(ctypes.get_errno(), "inotify_add_watch 失敗")
+
+    def wait(self, timeout: float):
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if readable:
+            try:
+                while os.read(self.fd, 4096):
+                    pass
+            except BlockingIOError:
+                pass
+
+    def close(self):
+        os.close(self.fd)
+
+
+class _PollWatcher:
+    def wait(self, timeout: float):
+        time.sleep(timeout)
+
+    def close(self):
+        pass
+
+
+class FileFollower:
+    """追蹤另一個程式持續寫入的資料檔，只解析新增的位元組
+
+    從檔案目前的結尾開始追蹤（與 tail -f 相同），每次最多讀取 READ_BLOCK_SIZE 位元組，
+    不完整的最後一行會保留到下次讀取。
+    Linux 上以 inotify 等待檔案變更，其他平台改為定時輪詢；
+    檔案被截斷或替換時會從新檔案的開頭重新讀取。
+    """
+
+    def __init__(self, file_path: str, dataset: LiveDataset, poll_interval: float = 0.5):
+        self.file_path = file_path
+        self.dataset = dataset
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+
+    def _create_watcher(self):
+        try:
+            return _InotifyWatcher(self.file_path)
+        except (OSError, AttributeError, TypeError):
+            return _PollWatcher()
+
+    def _run(self):
+        watcher = self._create_watcher()
+        print(f"追蹤資料檔：{self.file_path}（{'inotify' if isinstance(watcher, _InotifyWatcher) else '輪詢'}）")
+        f = open(self.file_path, 'rb')
+        inode = os.fstat(f.fileno()).st_ino
+        f.seek(0, os.SEEK_END)
+        partial = b""
+        try:
+            while not self._stop.is_set():
+                chunk = f.read(READ_BLOCK_SIZE)
+                if chunk:
+                    lines = (partial + chunk).split(b'\n')
+                    partial = lines.pop()
+                    if len(partial) > MAX_LINE_BYTES:
+                        print(f"警告：資料行超過 {MAX_LINE_BYTES} 位元組仍未結束，已丟棄")
+                        partial = b""
+                    rows = [row for row in (parse_line(line.decode('utf-8', errors='replace')) for line in lines)
+                            if row is not None]
+                    if rows:
+                        self.dataset.append(rows)
+                    continue
+
+                # 檔案被替換或截斷時重新開啟
+                try:
+                    stat = os.stat(self.file_path)
+                except FileNotFoundError:
+                    stat = None
+                if stat is not None and (stat.st_ino != inode or stat.st_size < f.tell()):
+                    f.close()
+                    watcher.close()
+                    f = open(self.file_path, 'rb')
+                    inode = os.fstat(f.fileno()).st_ino
+                    partial = b""
+                    self.dataset.restart_timeline()
+                    watcher = self._create_watcher()
+                    print("資料檔已被替換或截斷，從頭開始讀取")
+                    continue
+                watcher.wait(self.poll_interval)
+        except Exception as e:
+            print(f"追蹤資料檔時發生錯誤: {e}")
+            traceback.print_exc()
+        finally:
+            f.close()
+            watcher.close()
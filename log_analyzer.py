@@ -0,0 +1,327 @@
+import argparse
+import glob
+import json
+import os
+import traceback
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app_config import AppConfig
+from checkpoint_manager import CheckpointManager, write_json_atomic
+from field_monitor import ANALOG_TO_NT
+
+AXES = ('x', 'y', 'z')
+COMMAND_COLUMNS = ['bx_nt', 'by_nt', 'bz_nt']
+MEASURED_COLUMNS = ['analog_x', 'analog_y', 'analog_z']
+INDEX_FILENAME = "log_index.json"
+PERCENTILES = (5, 50, 95, 99)
+
+
+def _to_seconds(times: pd.Series) -> np.ndarray:
+    """將 ISO 時間字串轉為 UTC epoch 秒"""
+    ts = pd.to_datetime(times, utc=True, errors='coerce').dt.tz_localize(None)
+    seconds = ts.values.astype('datetime64[ns]').astype(np.int64) / 1e9
+    seconds[ts.isna().values] = np.nan
+    return seconds
+
+
+class LogIndex:
+    """記錄每個日誌檔的時間範圍與筆數，查詢特定時段時只讀取相關檔案"""
+
+    def __init__(self, log_dir: str, chunksize: int = 100000):
+        self.log_dir = log_dir
+        self.chunksize = chunksize
+        self.path = os.path.join(log_dir, INDEX_FILENAME)
+        self.entries: Dict[str, Dict] = {}
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def _save(self):
+        try:
+            write_json_atomic(self.path, self.entries)
+        except OSError as e:
+            print(f"寫入日誌索引失敗: {e}")
+
+    def _scan(self, file_path: str) -> Optional[Dict]:
+        """只讀取 utc_time 欄位計算時間範圍"""
+        start, end, rows = np.inf, -np.inf, 0
+        try:
+            for chunk in pd.read_csv(file_path, usecols=['utc_time'], chunksize=self.chunksize):
+                seconds = _to_seconds(chunk['utc_time'])
+                rows += len(seconds)
+                if np.isfinite(seconds).any():
+                    start = min(start, np.nanmin(seconds))
+                    end = max(end, np.nanmax(seconds))
+        except (ValueError, pd.errors.EmptyDataError) as e:
+            print(f"略過無法解析的日誌檔 {os.path.basename(file_path)}: {e}")
+            return None
+        if rows == 0 or not np.isfinite(start):
+            return None
+        return {"start": float(start), "end": float(end), "rows": rows}
+
+    def refresh(self) -> Dict[str, Dict]:
+        """掃描新增或變更的日誌檔，未變更的檔案沿用索引中的結果"""
+        self._load()
+        changed = False
+        current = {}
+        for file_path in sorted(glob.glob(os.path.join(self.log_dir, "log_*.csv"))):
+            name = os.path.basename(file_path)
+            identity = CheckpointManager.file_identity(file_path)
+            entry = self.entries.get(name)
+            if entry is not None and entry.get("identity") == identity:
+                current[name] = entry
+                continue
+            span = self._scan(file_path)
+            changed = True
+            if span is not None:
+                current[name] = {**span, "identity": identity}
+        if changed or len(current) != len(self.entries):
+            self.entries = current
+            self._save()
+        self.entries = current
+        return current
+
+    def files_in_range(self, start: Optional[float] = None, end: Optional[float] = None) -> List[str]:
+        files = []
+        for name, entry in self.refresh().items():
+            if start is not None and entry["end"] < start:
+                continue
+            if end is not None and entry["start"] > end:
+                continue
+            files.append(os.path.join(self.log_dir, name))
+        return files
+
+
+class ErrorStatistics:
+    """以固定記憶體累計各軸誤差（量測 - 指令）的統計量
+
+    百分位數由固定寬度直方圖估算，精度為 bin_width；直方圖以各軸第一批資料的平均誤差為中心、
+    涵蓋 ±error_range，因此線圈斷線等大幅偏移仍能正確估算。落在範圍外的百分位數只能得知其上下限，
+    summary 會以 p{q}_bound 標示（'<' 或 '>'）。時間視窗統計僅保留每個視窗的累加值。
+    """
+
+    def __init__(self, window: float = 3600.0, error_range: float = 5000.0, bin_width: float = 1.0):
+        self.window = window
+        self.error_range = error_range
+        self.bin_width = bin_width
+        self.bins = int(np.ceil(2 * error_range / bin_width))
+        # 索引 0 為下溢、bins + 1 為上溢
+        self.hist = np.zeros((len(AXES), self.bins + 2), dtype=np.int64)
+        self.center = np.full(len(AXES), np.nan)  # 各軸直方圖的中心，由第一批資料決定
+        self.count = np.zeros(len(AXES), dtype=np.int64)
+        self.sum = np.zeros(len(AXES))
+        self.sumsq = np.zeros(len(AXES))
+        self.min = np.full(len(AXES), np.inf)
+        self.max = np.full(len(AXES), -np.inf)
+        # 漂移以誤差對時間的線性迴歸斜率表示，時間以第一筆資料為原點避免數值誤差
+        self.t0: Optional[float] = None
+        self.sum_t = np.zeros(len(AXES))
+        self.sum_tt = np.zeros(len(AXES))
+        self.sum_te = np.zeros(len(AXES))
+        self.windows: Dict[float, np.ndarray] = {}  # 視窗起點 -> [count, sum, sumsq] x 軸
+
+    def update(self, seconds: np.ndarray, errors: np.ndarray):
+        """seconds 形狀為 (n,)，errors 形狀為 (n, 3)，NaN 表示缺少量測值"""
+        if len(seconds) == 0:
+            return
+        if self.t0 is None:
+            self.t0 = float(np.nanmin(seconds))
+        t = seconds - self.t0
+        valid = ~np.isnan(errors)
+        e = np.where(valid, errors, 0.0)
+        tv = np.where(valid, t[:, None], 0.0)
+
+        self.count += valid.sum(axis=0)
+        self.sum += e.sum(axis=0)
+        self.sumsq += (e * e).sum(axis=0)
+        self.sum_t += tv.sum(axis=0)
+        self.sum_tt += (tv * tv).sum(axis=0)
+        self.sum_te += (tv * e).sum(axis=0)
+        self.min = np.minimum(self.min, np.where(valid, errors, np.inf).min(axis=0))
+        self.max = np.maximum(self.max, np.where(valid, errors, -np.inf).max(axis=0))
+
+        for i in range(len(AXES)):
+            values = errors[valid[:, i], i]
+            if len(values) == 0:
+                continue
+            if np.isnan(self.center[i]):
+                self.center[i] = np.round(values.mean() / self.bin_width) * self.bin_width
+            idx = np.floor((values - self._lower_edge(i)) / self.bin_width).astype(np.int64) + 1
+            idx = np.clip(idx, 0, self.bins + 1)
+            self.hist[i] += np.bincount(idx, minlength=self.bins + 2)
+
+        starts, inverse = np.unique(np.floor(seconds / self.window) * self.window, return_inverse=True)
+        inverse = inverse.ravel()
+        acc = np.empty((len(starts), 3, len(AXES)))
+        for i in range(len(AXES)):
+            acc[:, 0, i] = np.bincount(inverse, weights=valid[:, i], minlength=len(starts))
+            acc[:, 1, i] = np.bincount(inverse, weights=e[:, i], minlength=len(starts))
+            acc[:, 2, i] = np.bincount(inverse, weights=e[:, i] * e[:, i], minlength=len(starts))
+        for start, values in zip(starts.tolist(), acc):
+            if start in self.windows:
+                self.windows[start] += values
+            else:
+                self.windows[start] = values
+
+    def _lower_edge(self, axis: int) -> float:
+        return self.center[axis] - self.error_range
+
+    def _percentile(self, axis: int, q: float) -> Tuple[float, Optional[str]]:
+        """回傳 (百分位數, 界限)；落在直方圖範圍外時回傳範圍邊界與 '<' 或 '>'"""
+        counts = self.hist[axis]
+        cumulative = np.cumsum(counts)
+        target = max(q / 100 * self.count[axis], 1)
+        idx = int(np.searchsorted(cumulative, target))
+        if idx == 0:
+            return float(self._lower_edge(axis)), '<'
+        if idx == self.bins + 1:
+            return float(self._lower_edge(axis) + self.bins * self.bin_width), '>'
+        # 在 bin 內線性內插
+        fraction = (target - (cumulative[idx] - counts[idx])) / counts[idx]
+        return float(self._lower_edge(axis) + (idx - 1 + fraction) * self.bin_width), None
+
+    def summary(self) -> Dict[str, Dict]:
+        result = {}
+        for i, axis in enumerate(AXES):
+            n = self.count[i]
+            if n == 0:
+                result[axis] = {"count": 0}
+                continue
+            bias = self.sum[i] / n
+            percentiles = {q: self._percentile(i, q) for q in PERCENTILES}
+            denom = n * self.sum_tt[i] - self.sum_t[i] ** 2
+            slope = (n * self.sum_te[i] - self.sum_t[i] * self.sum[i]) / denom if denom > 0 else 0.0
+            result[axis] = {
+                "count": int(n),
+                "bias": bias,
+                "rms": np.sqrt(self.sumsq[i] / n),
+                "std": np.sqrt(max(self.sumsq[i] / n - bias ** 2, 0.0)),
+                "min": float(self.min[i]),
+                "max": float(self.max[i]),
+                "drift_per_hour": slope * 3600,
+                "histogram_center": float(self.center[i]),
+                "outside_range": int(self.hist[i, 0] + self.hist[i, -1]),
+                **{f"p{q}": value for q, (value, _) in percentiles.items()},
+                **{f"p{q}_bound": bound for q, (_, bound) in percentiles.items()},
+            }
+        return result
+
+    def window_summary(self) -> List[Dict]:
+        rows = []
+        for start in sorted(self.windows):
+            count, total, sumsq = self.windows[start]
+            row = {"start": start}
+            for i, axis in enumerate(AXES):
+                n = count[i]
+                row[f"{axis}_count"] = int(n)
+                row[f"{axis}_bias"] = total[i] / n if n else np.nan
+                row[f"{axis}_rms"] = np.sqrt(sumsq[i] / n) if n else np.nan
+            rows.append(row)
+        return rows
+
+
+class LogAnalyzer:
+    """分塊串流讀取日誌檔，計算指令磁場與量測磁場之間的誤差"""
+
+    def __init__(self, log_dir: str, chunksize: int = 100000, window: float = 3600.0,
+                 error_range: float = 5000.0, bin_width: float = 1.0):
+        self.log_dir = log_dir
+        self.chunksize = chunksize
+        self.window = window
+        self.error_range = error_range
+        self.bin_width = bin_width
+        self.index = LogIndex(log_dir, chunksize)
+
+    def analyze(self, files: Optional[List[str]] = None, start: Optional[float] = None,
+                end: Optional[float] = None) -> ErrorStatistics:
+        if files is None:
+            files = self.index.files_in_range(start, end)
+        stats = ErrorStatistics(self.window, self.error_range, self.bin_width)
+        columns = ['utc_time'] + COMMAND_COLUMNS + MEASURED_COLUMNS
+        for file_path in files:
+            try:
+                header = pd.read_csv(file_path, nrows=0).columns
+                if not set(columns).issubset(header):
+                    print(f"略過缺少量測欄位的日誌檔：{os.path.basename(file_path)}")
+                    continue
+                for chunk in pd.read_csv(file_path, usecols=columns, chunksize=self.chunksize):
+                    seconds = _to_seconds(chunk['utc_time'])
+                    mask = ~np.isnan(seconds)
+                    if start is not None:
+                        mask &= seconds >= start
+                    if end is not None:
+                        mask &= seconds <= end
+                    if not mask.any():
+                        continue
+                    commanded = chunk[COMMAND_COLUMNS].to_numpy(dtype=float)[mask]
+                    measured = chunk[MEASURED_COLUMNS].to_numpy(dtype=float)[mask] * ANALOG_TO_NT
+                    stats.update(seconds[mask], measured - commanded)
+            except Exception as e:
+                print(f"分析日誌檔 {os.path.basename(file_path)} 時發生錯誤: {e}")
+                traceback.print_exc()
+        return stats
+
+
+def _parse_time(value: Optional[str]) -> Optional[float]:
+    if value is None:
+        return None
+    dt = datetime.fromisoformat(value)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def _format_time(seconds: float) -> str:
+    return datetime.fromtimestamp(seconds, timezone.utc).replace(tzinfo=None).isoformat()
+
+
+def main():
+    base_path = os.path.dirname(os.path.abspath(__file__))
+    config = AppConfig()
+    config_file = os.path.join(base_path, "config.json")
+    if os.path.exists(config_file):
+        with open(config_file, 'r', encoding='utf-8') as f:
+            config = AppConfig.from_dict(json.load(f))
+
+    parser = argparse.ArgumentParser(description="分析日誌中指令磁場與量測磁場的誤差")
+    parser.add_argument("files", nargs="*", help="要分析的日誌檔（預設為日誌資料夾內所有檔案）")
+    parser.add_argument("--log-dir", default=os.path.join(base_path, config.csv_log_folder), help="日誌資料夾")
+    parser.add_argument("--start", help="起始時間 (ISO 格式，UTC)")
+    parser.add_argument("--end", help="結束時間 (ISO 格式，UTC)")
+    parser.add_argument("--window", type=float, default=3600.0, help="時間視窗長度（秒）")
+    parser.add_argument("--chunksize", type=int, default=100000, help="每次讀取的列數")
+    parser.add_argument("--range", type=float, default=5000.0, dest="error_range", help="百分位數直方圖範圍 ±nT")
+    args = parser.parse_args()
+
+    analyzer = LogAnalyzer(args.log_dir, args.chunksize, args.window, args.error_range)
+    stats = analyzer.analyze(args.files or None, _parse_time(args.start), _parse_time(args.end))
+
+    print("誤差統計（量測 - 指令，單位 nT）：")
+    for axis, s in stats.summary().items():
+        if s["count"] == 0:
+            print(f" {axis.upper()}: 無資料")
+            continue
+        percentiles = ", ".join(f"P{q}{s[f'p{q}_bound'] or '='}{s[f'p{q}']:.1f}" for q in PERCENTILES)
+        print(f" {axis.upper()}: 筆數={s['count']} 偏差={s['bias']:.1f} RMS={s['rms']:.1f} "
+              f"標準差={s['std']:.1f} 範圍=[{s['min']:.1f}, {s['max']:.1f}] "
+              f"漂移={s['drift_per_hour']:.2f}/小時 {percentiles}")
+        if s["outside_range"]:
+            print(f"   警告：{s['outside_range']} 筆誤差超出百分位數直方圖範圍（{s['histogram_center']:g} ± {args.error_range:g} nT），"
+                  f"標示 < 或 > 的百分位數僅為界限，可用 --range 加大範圍")
+
+    print(f"\n時間視窗統計（每 {args.window:g} 秒，偏差/RMS）：")
+    for row in stats.window_summary():
+        axes = "  ".join(f"{axis.upper()}={row[f'{axis}_bias']:.1f}/{row[f'{axis}_rms']:.1f}" for axis in AXES)
+        print(f" {_format_time(row['start'])}  {axes}")
+
+
+if __name__ == "__main__":
+    main()
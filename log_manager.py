@@ -1,18 +1,17 @@
 import os
-import pandas as pd
 import threading
 import traceback
-from typing import Dict, List
+from typing import Dict, List, Optional
 from datetime import datetime
 
 class LogManager:
-    def __init__(self, log_dir: str, flush_interval: int = 10):
+    def __init__(self, log_dir: str, flush_interval: int = 10, log_file: Optional[str] = None):
         self.log_dir = log_dir
         self.flush_interval = flush_interval
         self._log: List[Dict] = []
         self._lock = threading.Lock()
-        self._setup_log_directory()
-        self.log_file = self._generate_log_filename()
+        # 指定 log_file 時延續既有的日誌檔（用於 --resume）
+        self.log_file = log_file or self._generate_log_filename()
 
     def _setup_log_directory(self):
         if not os.path.exists(self.log_dir):
@@ -32,8 +31,12 @@ class LogManager:
         
         with self._lock:
             try:
-                df = pd.DataFrame(self._log)
+                import pandas as pd
                 write_header = not os.path.exists(self.log_file)
+                if write_header:
+                    # 第一次寫入時才建立資料夾，避免啟動時的檔案系統操作
+                    self._setup_log_directory()
+                df = pd.DataFrame(self._log)
                 df.to_csv(self.log_file, mode='a', header=write_header, index=False)
                 self._log = []
             except Exception as e:
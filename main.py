@@ -1,32 +1,73 @@
 import threading
 import time
 import os
+import argparse
+import importlib
 import json
+import math
 import signal
 import sys
+from concurrent.futures import Future
 from datetime import datetime, timezone
-from typing import List
+from typing import List, Optional
 #from sklearn.linear_model import LinearRegression
 
 # 導入各模組
 from app_config import AppConfig
 from app_state import AppState
 from log_manager import LogManager
-from data_loader import DataLoader
+from checkpoint_manager import CheckpointManager
+from data_loader import DataLoader, PartialFrame, RowOffsetTracker, parse_time
+from dataset_catalog import DatasetCatalog, VirtualDataset
 from daq_controller import DAQController
 from command_interface import CommandInterface
+from field_monitor import FieldMonitor
+from live_follower import FileFollower, LiveDataset
 from testing_data import testing_data
 
 class MagneticFieldController:
-    def __init__(self):
+    def __init__(self, resume: bool = False, follow: Optional[str] = None):
         self.MAX_VOLTAGE = 10.0  # 最大電壓 ±10V
         self.voltage_gain = (1.182, 1.18, 1.206)  # 電壓乘數
         self.voltage_offset = (0.0, 0.0, 0.0)  # 電壓偏移
         self.base_path = os.path.dirname(os.path.abspath(__file__))
         self.config = self._load_config()
-        self.state = AppState(self.config.interval)
-        self.log_manager = LogManager(os.path.join(self.base_path, self.config.csv_log_folder), self.config.log_flush_interval)
+        self.pipeline = self._build_pipeline()
+        self._batch_transformed = False  # 資料是否已在載入時整批套用轉換
+        self.dataframe = None
+        self.data_files: List[str] = []
+        self._data_identities: List[dict] = []
+        self._row_offsets: Optional[RowOffsetTracker] = None  # 單一檔案時記錄各列的位元組位置
+        self._data_future: Optional[Future] = None
+        self._load_failed = False
+        # 輸出排程時間軸：第 k 個輸出時間為 run_epoch + k * 間隔 (time.time())，恢復時沿用
+        self.run_epoch: Optional[float] = None
+        self._grid_interval: Optional[float] = None
+        self._last_output_time: Optional[float] = None  # 最後一筆輸出的時間 (time.time())
+        self.follower: Optional[FileFollower] = None
+        self._auto_paused = False  # 目前的暫停是否由讀值監控自動觸發
+
+        log_dir = os.path.join(self.base_path, self.config.csv_log_folder)
+        self.checkpoint_manager = CheckpointManager(os.path.join(log_dir, "checkpoint.json"), self.config.checkpoint_interval)
+        if resume and follow:
+            print("警告：追蹤模式不使用檢查點，已忽略 --resume")
+        checkpoint = self._load_checkpoint() if resume and not follow else None
+        self.state = AppState(checkpoint["interval"] if checkpoint else self.config.interval)
+        self.log_manager = LogManager(log_dir, self.config.log_flush_interval,
+                                      log_file=checkpoint["log_file"] if checkpoint else None)
+        if follow:
+            self._start_following(follow)
+        elif checkpoint:
+            self._restore_checkpoint(checkpoint)
+        else:
+            # 設定檔已指定資料檔時立即於背景開始載入
+            self._preload_configured_file()
         self.command_interface = CommandInterface()
+        self.monitor = FieldMonitor(max_error_nt=self.config.monitor_max_error_nt,
+                                    z_threshold=self.config.monitor_z_threshold,
+                                    stuck_steps=self.config.monitor_stuck_steps,
+                                    saturation_volts=self.config.monitor_saturation_volts,
+                                    relearn_steps=self.config.monitor_relearn_steps)
         self.channels = {'ao': [f"{self.config.device_name}/ao{i}" for i in (2, 3, 1, 0)],
                          'do': [f"{self.config.device_name}/port0/line{i}" for i in range(8,32)],
                          'ai': [f"{self.config.device_name}/ai{i}" for i in range(19, 22)]}
@@ -46,12 +87,14 @@ class MagneticFieldController:
         self.command_interface.register_command("save config", lambda _: self._cmd_save_config(), "保存當前設定")
         self.command_interface.register_command("stop", lambda _: self._cmd_stop(), "停止程式")
         self.command_interface.register_command("help", lambda _: self.command_interface.show_help(), "顯示此幫助")
-        self.command_interface.register_command("jump", self._cmd_jump, "跳至指定行數，用法: jump <行數>")
-        self.calibrators = {
-            "x": {"model": LinearRegression(), "X": [], "y": []},
-            "y": {"model": LinearRegression(), "X": [], "y": []},
-            "z": {"model": LinearRegression(), "X": [], "y": []},
-        }
+        self.command_interface.register_command("jump", self._cmd_jump, "跳至指定行數或時間，用法: jump <行數|時間>")
+        self.command_interface.register_command("alerts", lambda _: self._cmd_alerts(), "顯示量測異常警示")
+        # 校準模型僅供 fix_voltage_offset 使用（目前停用）
+        #self.calibrators = {
+        #    "x": {"model": LinearRegression(), "X": [], "y": []},
+        #    "y": {"model": LinearRegression(), "X": [], "y": []},
+        #    "z": {"model": LinearRegression(), "X": [], "y": []},
+        #}
 
     def _load_config(self) -> AppConfig:
         config_file = os.path.join(self.base_path, "config.json")
@@ -85,6 +128,118 @@ class MagneticFieldController:
             print(f"保存配置時發生錯誤: {e}")
             return False
 
+    def _warm_up_imports(self):
+        """在使用者選擇檔案的同時，於背景預先匯入耗時的套件"""
+        def worker():
+            for module in ("pandas", "numpy", "nidaqmx", "nidaqmx.system", "nidaqmx.stream_writers"):
+                try:
+                    importlib.import_module(module)
+                except Exception:
+                    pass
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _build_pipeline(self):
+        """依 config.json 的 transforms 建立轉換流程；此時只驗證設定，numpy 與 scipy 在第一次轉換時才匯入"""
+        if not self.config.transforms:
+            return None
+        from transform_pipeline import TransformPipeline
+        try:
+            return TransformPipeline.from_config(self.config.transforms)
+        except ValueError as e:
+            print(f"錯誤：轉換設定無效: {e}")
+            sys.exit(1)
+
+    def _start_loading(self, file_paths: List[str], resume_at: Optional[dict] = None):
+        """記錄資料檔識別資訊並開始載入；多個檔案時組成虛擬資料集，依播放進度逐一載入
+
+        resume_at 為檢查點記錄的 {"row", "offset"}：單一檔案且沒有依賴先前資料的轉換時，
+        直接從該位置讀取，不需解析整個檔案。
+        """
+        self.data_files = [os.path.abspath(path) for path in file_paths]
+        self._data_identities = [CheckpointManager.file_identity(path) for path in file_paths]
+        if len(file_paths) == 1:
+            # 單一檔案在載入後整批套用轉換，多檔與追蹤模式則在輸出時逐筆轉換
+            self._batch_transformed = self.pipeline is not None
+            if resume_at is not None and self.pipeline is not None and self.pipeline.stateful:
+                resume_at = None
+            if resume_at is not None:
+                print(f"從第 {resume_at['row']} 行的位置開始讀取資料檔")
+            self._row_offsets = RowOffsetTracker(file_paths[0], resume_at)
+            self._data_future = DataLoader.preload(file_paths[0], self.pipeline.apply_batch if self.pipeline else None,
+                                                   resume_at)
+            return
+        folder = os.path.dirname(self.data_files[0])
+        names = {os.path.basename(path) for path in self.data_files}
+        entries = [entry for entry in DatasetCatalog(folder).refresh() if entry["name"] in names]
+        self._data_future = Future()
+        self._data_future.set_result(VirtualDataset(folder, entries, self.config.max_open_files))
+
+    def _start_following(self, file_path: str):
+        """追蹤持續寫入的資料檔，新資料經固定延遲後輸出"""
+        if not os.path.isfile(file_path):
+            print(f"錯誤：找不到要追蹤的資料檔 {file_path}")
+            sys.exit(1)
+        dataset = LiveDataset(self.config.follow_window, self.config.follow_latency)
+        self.follower = FileFollower(file_path, dataset, self.config.follow_poll_interval)
+        self.follower.start()
+        self._data_future = Future()
+        self._data_future.set_result(dataset)
+
+    def _preload_configured_file(self):
+        """若 csv_input 指定了資料檔，則直接於背景載入，不再顯示選單"""
+        if not self.config.csv_input or self.config.csv_input == "None":
+            return
+        file_path = os.path.join(self.base_path, self.config.csv_folder, self.config.csv_input)
+        if not os.path.isfile(file_path):
+            print(f"警告：找不到設定的資料檔 {file_path}，改為手動選擇")
+            return
+        print(f"使用設定的資料檔：{self.config.csv_input}")
+        self._start_loading([file_path])
+
+    def _load_checkpoint(self) -> Optional[dict]:
+        """讀取檢查點並確認資料檔未被更動，失敗時回傳 None 改為一般啟動"""
+        checkpoint = self.checkpoint_manager.load()
+        if checkpoint is None:
+            print("找不到檢查點，改為一般啟動")
+            return None
+        identities = checkpoint.get("data_files") or []
+        if not identities or not all(CheckpointManager.matches_file(identity, identity.get("path", ""))
+                                     for identity in identities):
+            print("警告：資料檔已變更或不存在，無法從檢查點恢復，改為一般啟動")
+            return None
+        return checkpoint
+
+    def _restore_checkpoint(self, checkpoint: dict):
+        self.run_epoch = checkpoint["epoch"]
+        self._grid_interval = checkpoint["interval"]
+        # 透過跳行機制讓 output_loop 從下一筆未輸出的資料開始
+        self.state.skipped_row = checkpoint["current_row"]
+        self._start_loading([identity["path"] for identity in checkpoint["data_files"]], checkpoint.get("data_offset"))
+        print(f"從檢查點恢復：第 {checkpoint['current_row']} 行，日誌 {checkpoint['log_file']}")
+
+    def _save_checkpoint(self):
+        # 追蹤模式的資料檔持續變動，無法從檢查點恢復
+        if self._last_output_time is None or self.dataframe is None or self.follower is not None:
+            return
+        if self.state.current_row >= len(self.dataframe):
+            return
+        checkpoint = {
+            "current_row": self.state.current_row,
+            "epoch": self.run_epoch,
+            "interval": self._grid_interval,
+            "data_files": self._data_identities,
+            "log_file": self.log_manager.log_file,
+        }
+        if self._row_offsets is not None:
+            # 記錄下一筆的位元組位置，恢復時不必解析整個檔案
+            try:
+                checkpoint["data_offset"] = {"row": checkpoint["current_row"],
+                                             "offset": self._row_offsets.offset(checkpoint["current_row"])}
+            except (OSError, IndexError) as e:
+                print(f"計算資料位置失敗: {e}")
+        self.checkpoint_manager.save(checkpoint)
+
     def signal_handler(self, sig, frame):
         print(f"\n收到信號 {sig}，準備安全退出...")
         self.safe_stop()
@@ -92,21 +247,20 @@ class MagneticFieldController:
 
     def _choose_file(self):
         data_path = os.path.join(self.base_path, self.config.csv_folder)
-        files = [f for f in os.listdir(data_path) if f != '.gitkeep']
+        files = DatasetCatalog(data_path).refresh()
         if not files:
             print("錯誤：資料夾為空")
             sys.exit(1)
-        print("請選擇要載入的磁場資料檔案：")
-        for i, file in enumerate(files):
-            print(f"{i}: {file}")
+        print("請選擇要載入的磁場資料檔案（可用 起-迄 選擇多個連續檔案，例如 0-30）：")
+        for i, entry in enumerate(files):
+            print(f"{i}: {entry['name']} ({entry['rows']} 筆, {entry['start']} ~ {entry['end']})")
         try:
-            choice = int(input("請輸入檔案編號："))
-            if 0 <= choice < len(files):
-                file_path = os.path.join(data_path, files[choice])
-                self.dataframe = DataLoader.load_data(file_path)
-                if self.dataframe is None:
-                    print("錯誤：載入資料失敗")
-                    sys.exit(1)
+            choice = input("請輸入檔案編號：").strip()
+            first, _, last = choice.partition('-')
+            first = int(first)
+            last = int(last) if last else first
+            if 0 <= first <= last < len(files):
+                self._start_loading([os.path.join(data_path, entry['name']) for entry in files[first:last + 1]])
             else:
                 print("錯誤：無效的選擇")
                 return False
@@ -124,12 +278,15 @@ class MagneticFieldController:
     def safe_stop(self):
         self.state.stop = True
         print("\n正在安全停止程式...")
+        if self.follower is not None:
+            self.follower.stop()
         # 等待任務完成
         if self.state.task_active:
             print("等待DAQ任務結束...")
             time.sleep(1)
-        # 最後一次寫入日誌
+        # 最後一次寫入日誌，再更新檢查點
         self.log_manager.flush()
+        self._save_checkpoint()
         print("程式已安全停止。")
 
     def output_loop(self):
@@ -138,6 +295,7 @@ class MagneticFieldController:
             if self.state.skipped_row is not None:
                 self.state.current_row = self.state.skipped_row
                 self.state.skipped_row = None
+                self._reset_stream_transforms()
 
         # 誤差調整
         # self.fix_voltage_offset()
@@ -152,33 +310,79 @@ class MagneticFieldController:
                 print("DAQ初始化失敗，終止輸出線程")
                 return
 
+            # DAQ 初始化與資料解析同時進行，此處等待資料載入完成（失敗時由 _on_data_loaded 回報）
+            if self._data_future.exception() is not None or self._data_future.result() is None:
+                return
+            self.dataframe = self._data_future.result()
+
             self.state.task_active = True
             daq.write_digital([True] * len(self.channels.get('do', [])))  # 設定數位輸出為高電平
 
+            if self.pipeline is not None:
+                # 逐筆轉換的模式在第一筆輸出前載入 numpy 與 scipy，不延誤第一筆的輸出時間
+                self.pipeline.prepare()
             print("DAQ任務已初始化，開始輸出...")
-            
+
+            following = self.follower is not None
+            deadline = None
+            last_live_output: Optional[float] = None  # 追蹤模式上一筆的輸出時間 (time.perf_counter())
+            live_delay = 0.0  # 追蹤模式因暫停累積的額外延遲（秒）
             self.state.current_row = 0
-            while self.state.current_row < len(self.dataframe):
+            while following or self.state.current_row < len(self.dataframe):
 
                 skip_function() 
-                row = self.dataframe.iloc[self.state.current_row]
+                if following:
+                    live_due = self._wait_for_live_row(last_live_output, live_delay)
+                    if live_due is None:
+                        break
+                    try:
+                        row = self.dataframe.iloc[self.state.current_row]
+                    except IndexError:
+                        # 等待期間該筆已被淘汰，下一輪重新對齊保留範圍
+                        continue
+                else:
+                    try:
+                        row = self.dataframe.iloc[self.state.current_row]
+                    except (ValueError, IndexError) as e:
+                        if not self._skip_unreadable_file(e):
+                            break
+                        continue
                 
                 if self.state.stop:
                     break
                  
+                was_paused = self.state.paused
                 while self.state.paused and not self.state.stop:
                     time.sleep(0.1)
                 
                 if self.state.stop:
                     break
 
-                # 計算開始時間
-                start_time = time.perf_counter()
+                # 追蹤模式依資料時間戳記與固定延遲輸出，其餘依排程時間軸輸出
+                if following:
+                    last_live_output = time.perf_counter()
+                    if was_paused and last_live_output > live_due:
+                        # 暫停後整條時間軸順延，暫停期間累積的資料仍保持原始間隔
+                        live_delay += last_live_output - live_due
+                else:
+                    if deadline is None:
+                        deadline = self._first_deadline()
+                    elif time.time() - deadline >= self.state.interval:
+                        # 暫停或延誤超過一個間隔時，對齊時間軸上的下一個時間點，不補輸出
+                        deadline = self._next_deadline(time.time())
+                    if not self._wait_until(deadline):
+                        continue
+
+                self._last_output_time = time.time()
+
+                bx, by, bz = row.Bx, row.By, row.Bz
+                if self.pipeline is not None and not self._batch_transformed:
+                    bx, by, bz = self.pipeline.process_row(bx, by, bz)
                     
                 # 計算電壓（限制最大電壓）
-                vx = row.Bx * self.config.nt_to_volt * self.voltage_gain[0] + self.voltage_offset[0]
-                vy = row.By * self.config.nt_to_volt * self.voltage_gain[1] + self.voltage_offset[1]
-                vz = row.Bz * self.config.nt_to_volt * self.voltage_gain[2] + self.voltage_offset[2]
+                vx = bx * self.config.nt_to_volt * self.voltage_gain[0] + self.voltage_offset[0]
+                vy = by * self.config.nt_to_volt * self.voltage_gain[1] + self.voltage_offset[1]
+                vz = bz * self.config.nt_to_volt * self.voltage_gain[2] + self.voltage_offset[2]
 
                 vx = max(min(vx, self.MAX_VOLTAGE), -self.MAX_VOLTAGE) / -2
                 vy = max(min(vy, self.MAX_VOLTAGE), -self.MAX_VOLTAGE) / -2
@@ -194,7 +398,7 @@ class MagneticFieldController:
                 local_time = datetime.now().replace(microsecond=0).isoformat()
 
                 # 輸出結果
-                print(f"[{local_time}] 輸出 B(nT)=({row.Bx:.1f}, {row.By:.1f}, {row.Bz:.1f}) → V=({vx:.4f}, {vy:.4f}, {vz:.4f}) {'✓' if voltage_output_success else '✗'}")
+                print(f"[{local_time}] 輸出 B(nT)=({bx:.1f}, {by:.1f}, {bz:.1f}) → V=({vx:.4f}, {vy:.4f}, {vz:.4f}) {'✓' if voltage_output_success else '✗'}")
 
                 # 讀取類比信號
                 analog_data = daq.read_analog()
@@ -206,6 +410,7 @@ class MagneticFieldController:
                         axis = ['x', 'y', 'z'][i] if i < 3 else 'other'
                         print(f'{axis.upper()}={measured * 100000: .0f}(nT)', end='; ')
                     print('')
+                    self._check_readback((bx, by, bz), analog_data)
                 else:
                     print("讀取類比信號失敗")
 
@@ -214,9 +419,9 @@ class MagneticFieldController:
                     "index": self.state.current_row,	
                     "utc_time": now,
                     "local_time": local_time,
-                    "bx_nt": row.Bx,
-                    "by_nt": row.By,
-                    "bz_nt": row.Bz,
+                    "bx_nt": bx,
+                    "by_nt": by,
+                    "bz_nt": bz,
                     "vx": vx,
                     "vy": vy,
                     "vz": vz,
@@ -233,24 +438,112 @@ class MagneticFieldController:
                 self.log_manager.add_entry(log_entry)
                 
                 self.state.current_row += 1
+                if not following:
+                    deadline = self._next_deadline(deadline)
                 
                 # 定期寫入日誌
                 rows_processed += 1
                 if self.log_manager.should_flush(rows_processed):
                     self.log_manager.flush()
-                    
-                # 計算需要等待的時間
-                elapsed = time.perf_counter() - start_time
-                wait_time = max(0, self.state.interval - elapsed)
-                
-                # 分段等待，以便能夠更快地響應暫停或停止命令
-                wait_end_time = time.perf_counter() + wait_time
-                while time.perf_counter() < wait_end_time and not self.state.stop and not self.state.paused:
-                    time.sleep(0.1)
 
+                # 定期更新檢查點（先寫入日誌，確保檢查點不會超前日誌）
+                if self.checkpoint_manager.should_checkpoint(rows_processed):
+                    self.log_manager.flush()
+                    self._save_checkpoint()
+
+            if not following and self.state.current_row >= len(self.dataframe):
+                self.checkpoint_manager.clear()
             self.state.task_active = False
             print("模擬完成，已停止輸出。")
             
+    def _wait_for_live_row(self, last_output: Optional[float], delay: float = 0.0) -> Optional[float]:
+        """追蹤模式下等待下一筆資料可輸出，回傳其排定的輸出時間 (time.perf_counter())；停止時回傳 None
+
+        有時間戳記的資料依 LiveDataset 的時間軸輸出（加上暫停累積的 delay）；
+        沒有時間戳記的資料改為到達後固定延遲輸出，且與上一筆至少相隔一個輸出間隔。
+        """
+        while not self.state.stop:
+            oldest = self.dataframe.oldest_row
+            if self.state.current_row < oldest:
+                print(f"警告：第 {self.state.current_row} 行已超出保留範圍，跳至第 {oldest} 行")
+                self.state.current_row = oldest
+                self._reset_stream_transforms()
+            arrival = self.dataframe.arrival(self.state.current_row)
+            if arrival is None:
+                time.sleep(0.05)
+                continue
+            due = self.dataframe.due(self.state.current_row)
+            if due is None:
+                due = arrival + self.dataframe.latency
+                if last_output is not None:
+                    due = max(due, last_output + self.state.interval)
+            due += delay
+            remaining = due - time.perf_counter()
+            if remaining <= 0:
+                return due
+            time.sleep(min(remaining, 0.1))
+        return None
+
+    def _skip_unreadable_file(self, error: Exception) -> bool:
+        """多檔播放時資料檔無法載入或筆數與索引不符，跳至下一個檔案；無法跳過時回傳 False 停止輸出"""
+        print(f"錯誤：讀取第 {self.state.current_row} 行失敗: {error}")
+        next_row = None
+        if isinstance(self.dataframe, VirtualDataset):
+            next_row = self.dataframe.next_file_row(self.state.current_row)
+        if next_row is None:
+            self.state.stop = True
+            print("沒有可繼續輸出的資料，已停止輸出，輸入 stop 結束程式")
+            return False
+        print(f"跳過此檔案，從第 {next_row} 行繼續")
+        self.state.current_row = next_row
+        self._reset_stream_transforms()
+        return True
+
+    def _reset_stream_transforms(self):
+        """逐筆轉換時跳行（jump、--resume 或追蹤模式跳過已淘汰的資料）後重設濾波狀態，
+        避免沿用跳行前的資料；整批轉換的資料已包含完整的濾波結果，不需重設"""
+        if self.pipeline is not None and not self._batch_transformed:
+            self.pipeline.reset()
+
+    def _check_readback(self, commanded, analog_data):
+        alerts = self.monitor.update(commanded, analog_data)
+        if not alerts:
+            return
+        for alert in alerts:
+            self.command_interface.notify(alert)
+        if self.config.monitor_auto_pause and not self.state.paused:
+            self._auto_paused = True
+            self.state.paused = True
+            self.command_interface.notify("已自動暫停輸出，確認後輸入 resume 繼續")
+
+    def _first_deadline(self) -> float:
+        if self.run_epoch is None:
+            self.run_epoch = time.time()
+            self._grid_interval = self.state.interval
+            return self.run_epoch
+        # 從檢查點恢復：沿用原本的時間軸，於下一個排程時間點輸出
+        return self._next_deadline(time.time())
+
+    def _next_deadline(self, after: float) -> float:
+        """排程時間軸上晚於 after 的第一個時間點"""
+        interval = self.state.interval
+        if interval != self._grid_interval:
+            # 間隔改變時以 after 為新的起點，之後依新的間隔排列
+            self.run_epoch, self._grid_interval = after, interval
+            return after + interval
+        # 容許 1 ms 誤差：time.time() 量級下 after 若就是時間軸上的點，浮點誤差不致算回同一點
+        k = math.floor((after - self.run_epoch + 1e-3) / interval) + 1
+        return self.run_epoch + k * interval
+
+    def _wait_until(self, deadline: float) -> bool:
+        """分段等待至 deadline，以便能夠更快地響應暫停或停止命令；被暫停或停止時回傳 False"""
+        while not self.state.stop and not self.state.paused:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return True
+            time.sleep(min(remaining, 0.1))
+        return False
+
     '''
     def fix_voltage_offset(self):
         """修正電壓偏移"""
@@ -311,6 +604,11 @@ class MagneticFieldController:
         
     def _cmd_resume(self) -> bool:
         self.state.paused = False
+        if self._auto_paused:
+            # 使用者已確認自動暫停的異常：清除警示並重新學習基準，
+            # 仍存在的異常會在下一筆資料重新回報（並再次暫停）
+            self._auto_paused = False
+            self.monitor.clear_alerts()
         print("已恢復輸出。")
         return True
         
@@ -334,17 +632,35 @@ class MagneticFieldController:
         return True
         
     def _cmd_status(self) -> bool:
+        if self.dataframe is None:
+            print("狀態：資料載入失敗" if self._load_failed else "狀態：資料載入中")
+            return True
+
         current_index = self.state.current_row
         total_rows = len(self.dataframe)
         progress = (current_index / total_rows) * 100 if total_rows > 0 else 0
         
-        print(f"狀態：{'暫停中' if self.state.paused else '執行中'}")
+        print(f"狀態：{'已停止' if self.state.stop else '暫停中' if self.state.paused else '執行中'}")
         print(f"進度：{current_index}/{total_rows} ({progress:.1f}%)")
         print(f"輸出間隔：{self.state.interval} 秒")
         print(f"電壓限制：±{self.state.voltage_limit} V")
         print(f"日誌緩存條目：{self.log_manager.entry_count}")
         return True
         
+    def _cmd_alerts(self) -> bool:
+        active = self.monitor.active_alerts
+        if active:
+            for axis, issues in active.items():
+                print(f"{axis.upper()} 軸目前異常：{'、'.join(sorted(issues))}")
+        else:
+            print("目前沒有異常")
+        for axis, stats in self.monitor.axis_stats().items():
+            print(f"{axis.upper()} 軸誤差：平均 {stats['bias']:.1f} nT，標準差 {stats['std']:.1f} nT（{stats['count']} 筆）")
+        print(f"累計警示：{self.monitor.alert_count}")
+        for alert in self.monitor.recent_alerts:
+            print(f" {alert}")
+        return True
+
     def _cmd_save_config(self) -> bool:
         if self.save_config():
             print("配置已保存")
@@ -363,33 +679,60 @@ class MagneticFieldController:
                 return True
                 
             parts = cmd.split()
-            if len(parts) != 2:
+            if len(parts) < 2:
                 raise ValueError("參數數量錯誤")
-            row_number = int(parts[1])
+            target = ' '.join(parts[1:])
+            if target.isdigit():
+                row_number = int(target)
+            else:
+                row_number = self._row_at_time(target)
             if row_number < 0 or row_number >= len(self.dataframe):
                 raise ValueError("行數超出範圍")
+            if isinstance(self.dataframe, PartialFrame) and row_number < self.dataframe.first_row:
+                raise ValueError(f"從檢查點恢復時只載入了第 {self.dataframe.first_row} 行之後的資料")
             self.state.skipped_row = row_number
             print(f"跳至行數 {row_number}")
         except ValueError as e:
-            print(f"無效的行數: {e}")
-            print("語法錯誤，使用：jump <行數>")
+            print(f"無效的行數或時間: {e}")
+            print("語法錯誤，使用：jump <行數|時間>，例如 jump 120 或 jump 2024-01-15T12:00:00")
         except IndexError:
             print("行數超出範圍")
-            print("語法錯誤，使用：jump <行數>")
+            print("語法錯誤，使用：jump <行數|時間>")
         except Exception as e:
             print(f"發生錯誤: {e}")
             return True
         return True
     
 
+    def _row_at_time(self, text: str) -> int:
+        epoch = parse_time(text)
+        if epoch is None:
+            raise ValueError(f"無法解析時間 {text}")
+        if isinstance(self.dataframe, LiveDataset):
+            raise ValueError("追蹤模式不支援依時間跳轉")
+        if isinstance(self.dataframe, VirtualDataset):
+            row_number = self.dataframe.row_at(epoch)
+        elif isinstance(self.dataframe, PartialFrame):
+            row_number = self.dataframe.first_row + DataLoader.find_time_row(self.dataframe.frame, epoch)
+        else:
+            row_number = DataLoader.find_time_row(self.dataframe, epoch)
+        if row_number >= len(self.dataframe):
+            raise ValueError("時間晚於資料結尾")
+        return row_number
+
     def run(self):
         print("=== 磁場模擬控制器 ===")
-        while not self._choose_file():
-            pass
+        self._warm_up_imports()
+        if self._data_future is None:
+            while not self._choose_file():
+                pass
         
         output_thread = threading.Thread(target=self.output_loop, daemon=True)
         output_thread.start()
 
+        # 不等待資料解析完成即進入指令模式，載入期間 status 會顯示載入中
+        self._data_future.add_done_callback(self._on_data_loaded)
+
         try:
             self.command_interface.start_interactive_loop(">> ")
         finally:
@@ -403,7 +746,28 @@ class MagneticFieldController:
             # 最後一次寫入日誌
             self.log_manager.flush()
             print(f"日誌已保存至：{self.config.csv_log_folder}")
+        if self._load_failed:
+            sys.exit(1)
+
+    def _on_data_loaded(self, future: Future):
+        """資料載入完成時由載入執行緒呼叫"""
+        error = future.exception()
+        if error is not None:
+            print(f"\n載入資料時發生錯誤: {error}")
+        dataframe = None if error is not None else future.result()
+        if dataframe is None:
+            self._load_failed = True
+            self.state.stop = True
+            print("\n錯誤：載入資料失敗，輸入 stop 結束程式")
+            return
+        self.dataframe = dataframe
 
 if __name__ == "__main__":
-    controller = MagneticFieldController()
+    parser = argparse.ArgumentParser(description="磁場模擬控制器")
+    parser.add_argument("--resume", action="store_true", help="從上次的檢查點恢復輸出並延續同一份日誌")
+    parser.add_argument("--follow", metavar="FILE", help="追蹤另一個程式持續寫入的資料檔，輸出新增的資料")
+    args = parser.parse_args()
+    if args.resume and args.follow:
+        parser.error("--resume 不可與 --follow 同時使用（追蹤模式不寫入檢查點）")
+    controller = MagneticFieldController(resume=args.resume, follow=args.follow)
     controller.run()
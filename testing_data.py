@@ -1,45 +1,26 @@
-testing_data = [
-    [0, 0, 0],
-    [0.25, 0, 0],
-    [0, 0.25, 0],
-    [0, 0, 0.25],
-    [0.25, 0.25, 0],
-    [0.25, 0, 0.25],
-    [0, 0.25, 0.25],
-    [0.25, 0.25, 0.25],
-    [0.2, 0, 0],
-    [0, 0.2, 0],
-    [0, 0, 0.2],
-    [0.2, 0.2, 0],
-    [0.2, 0, 0.2],
-    [0, 0.2, 0.2],
-    [0.2, 0.2, 0.2],
-    [0.1, 0, 0],
-    [0, 0.1, 0],
-    [0, 0, 0.1],
-    [0.1, 0.1, 0],
-    [0.1, 0, 0.1],
-    [0, 0.1, 0.1],
-    [0.1, 0.1, 0.1],
-    [-0.25, 0, 0],
-    [0, -0.25, 0],
-    [0, 0, -0.25],
-    [-0.25, -0.25, 0],
-    [-0.25, 0, -0.25],
-    [0, -0.25, -0.25],
-    [-0.25, -0.25, -0.25],
-    [-0.2, 0, 0],
-    [0, -0.2, 0],
-    [0, 0, -0.2],
-    [-0.2, -0.2, 0],
-    [-0.2, 0, -0.2],
-    [0, -0.2, -0.2],
-    [-0.2, -0.2, -0.2],
-    [-0.1, 0, 0],
-    [0, -0.1, 0],
-    [0, 0, -0.1],
-    [-0.1, -0.1, 0],
-    [-0.1, 0, -0.1],
-    [0, -0.1, -0.1],
-    [-0.1, -0.1, -0.1]
-]
\ No newline at end of file
+from typing import List, Sequence
+
+# 校準時依序輸出的軸組合：單軸、雙軸、三軸
+AXIS_MASKS = [
+    (1, 0, 0),
+    (0, 1, 0),
+    (0, 0, 1),
+    (1, 1, 0),
+    (1, 0, 1),
+    (0, 1, 1),
+    (1, 1, 1),
+]
+
+CALIBRATION_LEVELS = [0.25, 0.2, 0.1, -0.25, -0.2, -0.1]
+
+
+def calibration_steps(levels: Sequence[float] = CALIBRATION_LEVELS) -> List[List[float]]:
+    """產生校準用的階梯向量：零點之後，每個強度依序套用所有軸組合"""
+    steps = [[0, 0, 0]]
+    for level in levels:
+        for mask in AXIS_MASKS:
+            steps.append([level * m for m in mask])
+    return steps
+
+
+testing_data = calibration_steps()
@@ -0,0 +1,101 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+
+class FakeDAQ:
+    """取代 DAQController：記錄每次輸出的時間與電壓，讀值等於最後一次的指令磁場"""
+
+    writes = []
+
+    def __init__(self, device_name, channels):
+        self.ao_task = True
+        self.last = [0.0, 0.0, 0.0]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    def write_digital(self, values):
+        return True
+
+    def write_voltages(self, voltages):
+        FakeDAQ.writes.append((time.time(), list(voltages)))
+        self.last = voltages[:3]
+        return True
+
+    def read_analog(self):
+        return [0.0, 0.0, 0.0]
+
+
+def write_comma_file(path, rows, start=0):
+    """寫入逗號分隔格式的資料檔，第 i 筆的 Bx 為 i，方便確認輸出的是哪一筆"""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("# test data\nyear,month,day,time,Bx,By,Bz\n")
+        for i in range(start, start + rows):
+            f.write(f"2024,01,01,{i // 3600:02d}:{i // 60 % 60:02d}:{i % 60:02d},{i},0,0\n")
+
+
+@pytest.fixture
+def generate():
+    """以 data_generator.py 命令列產生資料檔；關鍵字參數對應命令列選項"""
+
+    def run(path, rows=100, **options):
+        command = [sys.executable, os.path.join(REPO_DIR, "data_generator.py"), str(path), "--rows", str(rows)]
+        for name, value in options.items():
+            command += ["--" + name, str(value)]
+        subprocess.run(command, check=True, capture_output=True)
+        return path
+
+    return run
+
+
+@pytest.fixture
+def make_controller(tmp_path, monkeypatch):
+    """以暫存資料夾的設定建立 MagneticFieldController，DAQ 以 FakeDAQ 取代"""
+    import main
+    from app_config import AppConfig
+
+    monkeypatch.setattr(main, "DAQController", FakeDAQ)
+    monkeypatch.setattr(main.signal, "signal", lambda *args: None)
+    FakeDAQ.writes = []
+    os.makedirs(tmp_path / "data", exist_ok=True)
+
+    def factory(resume=False, follow=None, **config):
+        config.setdefault("csv_folder", str(tmp_path / "data"))
+        config.setdefault("csv_log_folder", str(tmp_path / "logs"))
+        monkeypatch.setattr(main.MagneticFieldController, "_load_config", lambda self: AppConfig(**config))
+        return main.MagneticFieldController(resume=resume, follow=follow)
+
+    return factory
+
+
+def run_output_loop(controller, seconds, during=None):
+    """在背景執行 output_loop 指定秒數後安全停止，回傳輸出的 [(列號, 輸出時間)]"""
+    emitted = []
+    add_entry = controller.log_manager.add_entry
+
+    def record(entry):
+        emitted.append((entry["index"], FakeDAQ.writes[-1][0]))
+        add_entry(entry)
+
+    controller.log_manager.add_entry = record
+    thread = threading.Thread(target=controller.output_loop, daemon=True)
+    thread.start()
+    if during is not None:
+        during(controller)
+    deadline = time.time() + seconds
+    while thread.is_alive() and time.time() < deadline:
+        time.sleep(0.01)
+    controller.safe_stop()
+    thread.join(timeout=3.0)
+    return emitted
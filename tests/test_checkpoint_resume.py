@@ -0,0 +1,132 @@
+import json
+import os
+import time
+
+import pytest
+
+pytest.importorskip("pandas")
+
+from checkpoint_manager import write_json_atomic
+from conftest import run_output_loop, write_comma_file
+from data_loader import DataLoader, PartialFrame, RowOffsetTracker
+
+INTERVAL = 0.2
+
+
+def _grid_position(controller, emitted_time):
+    return (emitted_time - controller.run_epoch) / controller._grid_interval
+
+
+def _assert_on_grid(controller, emitted):
+    for _, emitted_time in emitted:
+        position = _grid_position(controller, emitted_time)
+        assert abs(position - round(position)) < 0.25, position
+
+
+def test_next_deadline_follows_grid_and_regrids_on_interval_change(make_controller):
+    controller = make_controller(interval=2.0)
+    epoch = 1.7e9 + 0.123
+    controller.run_epoch, controller._grid_interval = epoch, 2.0
+
+    # 時間軸上的點本身不會因浮點誤差算回同一點
+    assert controller._next_deadline(epoch) == pytest.approx(epoch + 2.0)
+    assert controller._next_deadline(epoch + 2.0) == pytest.approx(epoch + 4.0)
+    assert controller._next_deadline(epoch + 2.5) == pytest.approx(epoch + 4.0)
+
+    controller.state.interval = 3.0
+    assert controller._next_deadline(epoch + 4.0) == pytest.approx(epoch + 7.0)
+    assert controller.run_epoch == pytest.approx(epoch + 4.0)
+    assert controller._next_deadline(epoch + 7.0) == pytest.approx(epoch + 10.0)
+
+
+def test_first_deadline_starts_a_grid_or_continues_the_restored_one(make_controller):
+    controller = make_controller(interval=1.0)
+    before = time.time()
+    first = controller._first_deadline()
+    # 新的執行以第一筆輸出為時間軸起點，立即輸出
+    assert first == controller.run_epoch and first >= before
+
+    restored = make_controller(interval=1.0)
+    restored.run_epoch, restored._grid_interval = time.time() - 10.3, 1.0
+    assert restored._first_deadline() == pytest.approx(restored.run_epoch + 11.0)
+
+
+def test_pause_snaps_to_the_next_grid_point(make_controller, tmp_path):
+    write_comma_file(tmp_path / "data" / "a.csv", 100)
+    controller = make_controller(csv_input="a.csv", interval=INTERVAL)
+
+    def pause(controller):
+        time.sleep(0.5)
+        controller.state.paused = True
+        time.sleep(0.7)
+        controller.state.paused = False
+
+    emitted = run_output_loop(controller, 0.6, during=pause)
+    _assert_on_grid(controller, emitted)
+    gaps = [b[1] - a[1] for a, b in zip(emitted, emitted[1:])]
+    # 暫停後不補輸出錯過的資料
+    assert min(gaps) > INTERVAL * 0.75
+    assert max(gaps) > 0.6
+    assert [index for index, _ in emitted] == list(range(len(emitted)))
+
+
+def test_resume_continues_rows_log_and_grid_from_byte_offset(make_controller, tmp_path):
+    write_comma_file(tmp_path / "data" / "a.csv", 100)
+    config = dict(csv_input="a.csv", interval=INTERVAL, checkpoint_interval=1, log_flush_interval=1)
+    first = make_controller(**config)
+    emitted = run_output_loop(first, 0.7)
+    checkpoint = json.loads((tmp_path / "logs" / "checkpoint.json").read_text(encoding="utf-8"))
+    assert checkpoint["current_row"] == len(emitted)
+    assert checkpoint["data_offset"]["row"] == len(emitted)
+
+    time.sleep(0.3)
+    resumed = make_controller(resume=True, **config)
+    assert resumed.run_epoch == first.run_epoch
+    frame = resumed._data_future.result()
+    # 沒有轉換設定時直接從檢查點的位置讀取，不解析前面的資料
+    assert isinstance(frame, PartialFrame) and frame.first_row == len(emitted)
+    assert len(frame) == 100
+
+    more = run_output_loop(resumed, 0.7)
+    assert [index for index, _ in more] == list(range(len(emitted), len(emitted) + len(more)))
+    _assert_on_grid(resumed, more)
+    assert resumed.log_manager.log_file == first.log_manager.log_file
+    assert frame.iloc[len(emitted)].Bx == len(emitted)
+
+
+def test_stateful_transform_resume_parses_whole_file(make_controller, tmp_path):
+    write_comma_file(tmp_path / "data" / "a.csv", 50)
+    config = dict(csv_input="a.csv", interval=INTERVAL, checkpoint_interval=1,
+                  transforms=[{"type": "lowpass", "cutoff": 0.1, "sample_rate": 1.0}])
+    run_output_loop(make_controller(**config), 0.5)
+    resumed = make_controller(resume=True, **config)
+    assert not isinstance(resumed._data_future.result(), PartialFrame)
+
+
+@pytest.mark.parametrize("blank_lines", [False, True])
+def test_row_offset_reads_same_rows_as_full_load(tmp_path, blank_lines):
+    path = tmp_path / "a.txt"
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("Time Bx By Bz\n")
+        for i in range(30):
+            f.write(f"2024-01-01T00:00:{i:02d} {i} {i * 2} {i * 3}\n")
+            if blank_lines and i % 7 == 0:
+                f.write("\n")
+    full = DataLoader.load_data(str(path))
+    tracker = RowOffsetTracker(str(path))
+    for row in (0, 12, 29, 5):
+        tail = DataLoader.load_data(str(path), tracker.offset(row))
+        assert tail["Bx"].tolist() == full["Bx"].iloc[row:].tolist()
+        assert tail["Time"].tolist() == full["Time"].iloc[row:].tolist()
+    with pytest.raises(IndexError):
+        tracker.offset(31)
+
+
+def test_write_json_atomic_keeps_old_file_on_failure(tmp_path):
+    path = str(tmp_path / "sub" / "state.json")
+    write_json_atomic(path, {"row": 1})
+    with pytest.raises(TypeError):
+        write_json_atomic(path, {"row": object()})
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f) == {"row": 1}
+    assert os.listdir(tmp_path / "sub") == ["state.json"]
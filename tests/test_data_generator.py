@@ -0,0 +1,22 @@
+import subprocess
+
+import pytest
+
+pytest.importorskip("pandas")
+
+
+@pytest.mark.parametrize("fmt", ["csv", "txt"])
+@pytest.mark.parametrize("profile", ["storm+noise", "steps+ramps+sweep+noise", "calibration"])
+def test_output_does_not_depend_on_chunksize(generate, tmp_path, fmt, profile):
+    outputs = []
+    for chunksize in (1000, 333, 7):
+        path = generate(tmp_path / f"{chunksize}.{fmt}", rows=1000, format=fmt, profile=profile,
+                        seed=11, period=0.5, hold=13, chunksize=chunksize)
+        outputs.append(path.read_bytes())
+    assert outputs[0] == outputs[1] == outputs[2]
+
+
+def test_rejects_period_below_millisecond(generate, tmp_path):
+    with pytest.raises(subprocess.CalledProcessError) as excinfo:
+        generate(tmp_path / "a.csv", rows=10, period=0.0005)
+    assert "--period" in excinfo.value.stderr.decode()
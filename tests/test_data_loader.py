@@ -0,0 +1,39 @@
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from data_loader import COMMA_FORMAT, WHITESPACE_FORMAT, DataLoader, detect_format, parse_time
+from dataset_catalog import DatasetCatalog
+
+
+def _generate(generate, path, fmt):
+    generate(path, rows=25, format=fmt, profile="steps+noise", seed=3)
+
+
+def test_both_generator_formats_load_to_the_same_field(generate, tmp_path):
+    _generate(generate, tmp_path / "a.csv", "csv")
+    _generate(generate, tmp_path / "a.txt", "txt")
+    assert detect_format(str(tmp_path / "a.csv")) == COMMA_FORMAT
+    assert detect_format(str(tmp_path / "a.txt")) == WHITESPACE_FORMAT
+
+    comma = DataLoader.load_data(str(tmp_path / "a.csv"))
+    whitespace = DataLoader.load_data(str(tmp_path / "a.txt"))
+    assert len(comma) == len(whitespace) == 25
+    pd.testing.assert_frame_equal(comma[["Bx", "By", "Bz"]], whitespace[["Bx", "By", "Bz"]])
+
+
+def test_catalog_counts_rows_of_both_formats(generate, tmp_path):
+    _generate(generate, tmp_path / "a.csv", "csv")
+    _generate(generate, tmp_path / "b.txt", "txt")
+    entries = {entry["name"]: entry for entry in DatasetCatalog(str(tmp_path)).refresh()}
+    assert entries["a.csv"]["rows"] == entries["b.txt"]["rows"] == 25
+    assert entries["b.txt"]["start"] == "2024-01-01T00:00:00"
+
+
+@pytest.mark.parametrize("fmt", ["csv", "txt"])
+def test_sub_second_period_writes_unique_timestamps(generate, tmp_path, fmt):
+    generate(tmp_path / f"a.{fmt}", rows=10, format=fmt, period=0.25, start="2024-01-01T23:59:59")
+    df = DataLoader.load_data(str(tmp_path / f"a.{fmt}"))
+    times = [parse_time(text) for text in df["Time"]]
+    assert times[0] == parse_time("2024-01-01T23:59:59")
+    assert [b - a for a, b in zip(times, times[1:])] == pytest.approx([0.25] * 9)
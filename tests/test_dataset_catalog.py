@@ -0,0 +1,67 @@
+import json
+import os
+
+import pytest
+
+pytest.importorskip("pandas")
+
+from conftest import run_output_loop, write_comma_file
+from data_loader import parse_time
+from dataset_catalog import CATALOG_FILENAME, DatasetCatalog, VirtualDataset
+
+
+def test_parse_time_formats():
+    assert parse_time("2024 01 15 12") == parse_time("2024-01-15T12:00:00") == parse_time("2024 1 15 12:00:00")
+    assert parse_time("2024-01-15T12:00:00+08:00") == parse_time("2024-01-15T04:00:00")
+    assert parse_time("not a time") is None
+
+
+def test_row_at_spans_files_and_gaps(generate, tmp_path):
+    generate(tmp_path / "a.csv", start="2024-01-01T00:00:00")
+    generate(tmp_path / "b.csv", start="2024-01-01T00:10:00")
+    generate(tmp_path / "c.csv", start="2024-01-02T00:00:00")
+    entries = DatasetCatalog(str(tmp_path)).refresh()
+    dataset = VirtualDataset(str(tmp_path), entries)
+
+    assert dataset.row_at(parse_time("2023-12-31T00:00:00")) == 0
+    assert dataset.row_at(parse_time("2024 01 01 00:00:50")) == 50
+    # 落在兩個檔案之間的空檔時，回傳下一個檔案的第一筆
+    assert dataset.row_at(parse_time("2024-01-01T00:05:00")) == 100
+    assert dataset.row_at(parse_time("2024-01-01T00:10:30.5")) == 131
+    assert dataset.row_at(parse_time("2024-01-02T00:01:00")) == 260
+    assert dataset.row_at(parse_time("2025-01-01T00:00:00")) == len(dataset) == 300
+
+
+def _play(make_controller, folder, names):
+    controller = make_controller(interval=0.01, log_flush_interval=1000)
+    controller._start_loading([os.path.join(folder, name) for name in names])
+    emitted = run_output_loop(controller, 3.0)
+    return controller, [index for index, _ in emitted]
+
+
+def test_unreadable_file_is_skipped_in_multi_file_playback(make_controller, tmp_path):
+    folder = tmp_path / "data"
+    write_comma_file(folder / "a.csv", 5)
+    (folder / "b.txt").write_text("Time Bx\n2024-01-01T00:00:05 1\n2024-01-01T00:00:06 2\n", encoding="utf-8")
+    write_comma_file(folder / "c.csv", 5, start=7)
+
+    controller, rows = _play(make_controller, str(folder), ["a.csv", "b.txt", "c.csv"])
+    assert rows == [0, 1, 2, 3, 4, 7, 8, 9, 10, 11]
+    assert not controller.state.task_active
+
+
+def test_catalog_row_count_mismatch_does_not_kill_output(make_controller, tmp_path, capsys):
+    folder = tmp_path / "data"
+    write_comma_file(folder / "a.csv", 5)
+    write_comma_file(folder / "b.csv", 5, start=5)
+    DatasetCatalog(str(folder)).refresh()
+    # 模擬索引記錄的筆數與實際解析的筆數不符
+    catalog_path = folder / CATALOG_FILENAME
+    catalog = json.loads(catalog_path.read_text(encoding="utf-8"))
+    catalog["b.csv"]["rows"] = 8
+    catalog_path.write_text(json.dumps(catalog), encoding="utf-8")
+
+    controller, rows = _play(make_controller, str(folder), ["a.csv", "b.csv"])
+    assert rows == list(range(10))
+    assert not controller.state.task_active
+    assert "與索引記錄的 8 筆不符" in capsys.readouterr().out
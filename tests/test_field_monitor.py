@@ -0,0 +1,68 @@
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from field_monitor import ANALOG_TO_NT, FieldMonitor
+
+
+def _feed(monitor, commanded, rows, gain=1.002, noise_nt=1.0, rng=None):
+    """以固定增益誤差與雜訊模擬讀值，回傳期間的所有警示"""
+    rng = rng or random.Random(0)
+    alerts = []
+    for _ in range(rows):
+        analog = [(value * gain + rng.gauss(0.0, noise_nt)) / ANALOG_TO_NT for value in commanded]
+        alerts.extend(monitor.update(commanded, analog))
+    return alerts
+
+
+def test_gain_mismatch_level_shift_is_relearned():
+    monitor = FieldMonitor(relearn_steps=5)
+    rng = random.Random(1)
+    assert _feed(monitor, [1000.0, 0.0, 0.0], 50, rng=rng) == []
+
+    # 0.2% 增益誤差：指令切換到 40000 nT 時誤差由 2 nT 跳到 80 nT
+    alerts = _feed(monitor, [40000.0, 0.0, 0.0], 5, rng=rng)
+    assert len(alerts) == 1 and "誤差突變" in alerts[0]
+    assert _feed(monitor, [40000.0, 0.0, 0.0], 100, rng=rng) == []
+    assert monitor.active_alerts == {}
+    assert abs(monitor.axis_stats()["x"]["bias"] - 80.0) < 2.0
+
+
+def test_resume_after_auto_pause_does_not_repause_on_the_same_shift():
+    monitor = FieldMonitor(relearn_steps=1000)
+    rng = random.Random(2)
+    _feed(monitor, [1000.0, 0.0, 0.0], 50, rng=rng)
+    assert _feed(monitor, [40000.0, 0.0, 0.0], 1, rng=rng)
+
+    # resume 時清除警示並重新學習基準
+    monitor.clear_alerts()
+    assert _feed(monitor, [40000.0, 0.0, 0.0], 100, rng=rng) == []
+
+
+def test_absolute_error_is_never_relearned():
+    monitor = FieldMonitor(max_error_nt=5000.0, relearn_steps=5)
+    alerts = _feed(monitor, [40000.0, 0.0, 0.0], 100, gain=1.5)
+    assert len(alerts) == 1 and "誤差過大" in alerts[0]
+    assert monitor.active_alerts == {"x": {"誤差過大"}}
+
+
+def test_only_resume_after_auto_pause_clears_alerts(make_controller, monkeypatch):
+    controller = make_controller(monitor_auto_pause=True)
+    cleared = []
+    monkeypatch.setattr(controller.monitor, "clear_alerts", lambda: cleared.append(True))
+
+    controller._cmd_pause()
+    controller._cmd_resume()
+    assert cleared == []
+
+    monkeypatch.setattr(controller.monitor, "update", lambda commanded, analog: ["X 軸誤差突變"])
+    controller._check_readback([0.0, 0.0, 0.0], [0.0, 0.0, 0.0])
+    assert controller.state.paused
+    controller._cmd_resume()
+    assert cleared == [True] and not controller.state.paused
+
+    controller._cmd_pause()
+    controller._cmd_resume()
+    assert cleared == [True]
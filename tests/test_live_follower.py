@@ -0,0 +1,143 @@
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+import live_follower
+from conftest import REPO_DIR, run_output_loop
+from live_follower import FileFollower, LiveDataset, LiveRow, parse_line
+
+
+def _row(second, bx=0.0):
+    return LiveRow(f"2024-01-01T00:00:{second:02d}", bx, 0.0, 0.0)
+
+
+def _append_at(monkeypatch, dataset, clock, rows):
+    monkeypatch.setattr(live_follower.time, "perf_counter", lambda: clock)
+    dataset.append(rows)
+
+
+def _wait_for(condition, timeout=3.0):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.02)
+    return condition()
+
+
+def test_window_evicts_oldest_rows_and_keeps_global_numbering(monkeypatch):
+    dataset = LiveDataset(window=3, latency=1.0)
+    _append_at(monkeypatch, dataset, 10.0, [_row(0, 0), _row(1, 1)])
+    _append_at(monkeypatch, dataset, 20.0, [_row(2, 2), _row(3, 3), _row(4, 4)])
+
+    assert len(dataset) == 5 and dataset.oldest_row == 2
+    assert dataset.iloc[4].Bx == 4
+    with pytest.raises(IndexError):
+        dataset.iloc[1]
+    with pytest.raises(IndexError):
+        dataset.iloc[5]
+    # 已淘汰的列回傳最舊一筆的到達時間，尚未收到的列回傳 None
+    assert dataset.arrival(0) == dataset.arrival(2) == 20.0
+    assert dataset.arrival(5) is None
+    assert dataset.due(1) is None and dataset.due(5) is None
+
+
+def test_rows_are_scheduled_by_their_timestamps(monkeypatch):
+    dataset = LiveDataset(latency=2.0)
+    _append_at(monkeypatch, dataset, 100.0, [_row(0), _row(1), _row(3)])
+    assert [dataset.due(row) for row in range(3)] == [102.0, 103.0, 105.0]
+
+    # 寫入端抖動在延遲內時仍對齊同一條時間軸
+    _append_at(monkeypatch, dataset, 105.5, [_row(4)])
+    assert dataset.due(3) == 106.0
+
+    # 晚於排定時間才到達時重新建立錨點
+    _append_at(monkeypatch, dataset, 110.0, [_row(5), _row(6)])
+    assert [dataset.due(4), dataset.due(5)] == [112.0, 113.0]
+
+    # 沒有時間戳記的資料交由輸出端以輸出間隔排程；來源被替換後時間軸重新開始
+    _append_at(monkeypatch, dataset, 111.0, [LiveRow("", 1.0, 2.0, 3.0)])
+    assert dataset.due(6) is None
+    dataset.restart_timeline()
+    _append_at(monkeypatch, dataset, 111.0, [_row(0)])
+    assert dataset.due(7) == 113.0
+
+
+def test_parse_line_accepts_both_formats():
+    assert parse_line("2024,01,01,00:00:01,1.5,2,3") == LiveRow("2024 01 01 00:00:01", 1.5, 2.0, 3.0)
+    assert parse_line("2024-01-01T00:00:01 1.5 2 3") == LiveRow("2024-01-01T00:00:01", 1.5, 2.0, 3.0)
+    assert parse_line("year,month,day,time,Bx,By,Bz") is None
+
+
+def _follow(path, dataset):
+    follower = FileFollower(str(path), dataset, poll_interval=0.05)
+    follower.start()
+    time.sleep(0.2)
+    return follower
+
+
+def test_follower_keeps_partial_line_until_complete(tmp_path):
+    path = tmp_path / "live.txt"
+    path.write_text("Time Bx By Bz\n2024-01-01T00:00:00 9 9 9\n")
+    dataset = LiveDataset()
+    follower = _follow(path, dataset)
+    try:
+        with open(path, "a") as f:
+            f.write("2024-01-01T00:00:01 1 2 3\n2024-01-01T00:00:02 4 ")
+        assert _wait_for(lambda: len(dataset) == 1)
+        time.sleep(0.2)
+        assert len(dataset) == 1 and dataset.iloc[0].Bx == 1
+
+        with open(path, "a") as f:
+            f.write("5 6\n")
+        assert _wait_for(lambda: len(dataset) == 2)
+        assert dataset.iloc[1] == LiveRow("2024-01-01T00:00:02", 4.0, 5.0, 6.0)
+    finally:
+        follower.stop()
+
+
+@pytest.mark.parametrize("replace", [False, True])
+def test_follower_rereads_truncated_or_replaced_file(tmp_path, replace):
+    path = tmp_path / "live.txt"
+    path.write_text("".join(f"2024-01-01T00:00:{i:02d} {i} 0 0\n" for i in range(20)))
+    dataset = LiveDataset()
+    follower = _follow(path, dataset)
+    try:
+        content = "2024-01-02T00:00:00 100 0 0\n"
+        if replace:
+            (tmp_path / "new.txt").write_text(content)
+            os.replace(tmp_path / "new.txt", path)
+        else:
+            with open(path, "w") as f:
+                f.write(content)
+        assert _wait_for(lambda: len(dataset) == 1)
+        assert dataset.iloc[0].Bx == 100
+    finally:
+        follower.stop()
+
+
+def test_follow_output_keeps_data_spacing_with_fixed_latency(make_controller, tmp_path):
+    path = tmp_path / "live.txt"
+    path.write_text("Time Bx By Bz\n")
+    controller = make_controller(follow=str(path), interval=1.0, follow_latency=0.3, follow_poll_interval=0.05)
+
+    def append(controller):
+        time.sleep(0.3)
+        with open(path, "a") as f:
+            f.write("".join(f"2024-01-01T00:00:00.{i * 2}00 {i} 0 0\n" for i in range(5)))
+        append.written = time.time()
+
+    emitted = run_output_loop(controller, 2.0, during=append)
+    assert [index for index, _ in emitted] == [0, 1, 2, 3, 4]
+    times = [written for _, written in emitted]
+    # 依資料間隔 0.2 秒輸出，而非 interval 的 1 秒；第一筆約在到達後 latency 秒
+    assert [b - a for a, b in zip(times, times[1:])] == pytest.approx([0.2] * 4, abs=0.05)
+    assert 0.25 < times[0] - append.written < 0.5
+
+
+def test_resume_cannot_be_combined_with_follow(tmp_path):
+    result = subprocess.run([sys.executable, os.path.join(REPO_DIR, "main.py"), "--resume", "--follow", "live.txt"],
+                            cwd=tmp_path, capture_output=True, text=True)
+    assert result.returncode == 2
+    assert "--resume" in result.stderr
@@ -0,0 +1,104 @@
+import os
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+from log_analyzer import ErrorStatistics, LogAnalyzer, LogIndex
+
+T0 = 1704067200.0  # 2024-01-01T00:00:00Z
+
+
+def _errors(x, y=None, z=None):
+    n = len(x)
+    return np.column_stack([x, np.zeros(n) if y is None else y, np.zeros(n) if z is None else z])
+
+
+def test_percentiles_bias_and_spread_match_numpy():
+    rng = np.random.default_rng(0)
+    x = rng.normal(12.0, 40.0, 20000)
+    stats = ErrorStatistics(bin_width=1.0)
+    for start in range(0, len(x), 3000):
+        chunk = x[start:start + 3000]
+        stats.update(T0 + np.arange(start, start + len(chunk)), _errors(chunk))
+    s = stats.summary()["x"]
+    assert s["count"] == 20000
+    assert s["bias"] == pytest.approx(x.mean())
+    assert s["std"] == pytest.approx(x.std())
+    assert (s["min"], s["max"]) == (x.min(), x.max())
+    for q in (5, 50, 95, 99):
+        assert s[f"p{q}"] == pytest.approx(np.percentile(x, q), abs=1.0)
+        assert s[f"p{q}_bound"] is None
+    assert s["outside_range"] == 0
+
+
+def test_large_offset_is_resolved_by_centring_histogram():
+    # 線圈斷線：誤差約 -18000 nT，遠超出 ±5000 nT
+    rng = np.random.default_rng(1)
+    x = -18000.0 + rng.normal(0.0, 2.0, 5000)
+    stats = ErrorStatistics(error_range=5000.0)
+    stats.update(T0 + np.arange(len(x)), _errors(x))
+    s = stats.summary()["x"]
+    assert s["p5"] < s["p50"] < s["p95"]
+    assert s["p50"] == pytest.approx(np.percentile(x, 50), abs=1.0)
+    assert s["outside_range"] == 0
+
+
+def test_percentile_outside_histogram_is_reported_as_bound():
+    stats = ErrorStatistics(error_range=100.0)
+    stats.update(T0 + np.arange(100), _errors(np.zeros(100)))
+    stats.update(T0 + 100 + np.arange(300), _errors(np.full(300, -18000.0)))
+    s = stats.summary()["x"]
+    assert s["outside_range"] == 300
+    assert (s["p50"], s["p50_bound"]) == (-100.0, '<')
+    assert s["p5_bound"] == '<'
+    assert s["p99_bound"] is None and abs(s["p99"]) <= 1.0
+
+
+def test_drift_and_time_windows():
+    seconds = T0 + np.arange(7200.0)
+    x = 0.5 / 3600 * (seconds - T0) + 3.0  # 每小時漂移 0.5 nT
+    y = np.where(np.arange(7200) % 2 == 0, np.nan, 1.0)  # 缺少一半的量測值
+    stats = ErrorStatistics(window=3600.0)
+    stats.update(seconds, _errors(x, y))
+    s = stats.summary()
+    assert s["x"]["drift_per_hour"] == pytest.approx(0.5)
+    assert s["y"]["count"] == 3600
+    windows = stats.window_summary()
+    assert [row["start"] for row in windows] == [T0, T0 + 3600]
+    assert [row["x_count"] for row in windows] == [3600, 3600]
+    assert windows[1]["x_bias"] == pytest.approx(3.0 + 0.5 * (3600 + 1799.5) / 3600)
+
+
+def _write_log(path, start, rows, error=0.0):
+    times = pd.to_datetime(start + np.arange(rows), unit='s', utc=True)
+    pd.DataFrame({
+        "index": np.arange(rows),
+        "utc_time": [t.replace(tzinfo=None).isoformat() for t in times],
+        "bx_nt": 1000.0, "by_nt": 0.0, "bz_nt": 0.0,
+        "analog_x": (1000.0 + error) / 10000.0, "analog_y": 0.0, "analog_z": 0.0,
+    }).to_csv(path, index=False)
+
+
+def test_log_index_prunes_files_outside_time_range(tmp_path):
+    _write_log(tmp_path / "log_a.csv", T0, 100)
+    _write_log(tmp_path / "log_b.csv", T0 + 3600, 100, error=5.0)
+    _write_log(tmp_path / "log_c.csv", T0 + 7200, 100)
+    index = LogIndex(str(tmp_path), chunksize=30)
+
+    names = lambda files: [os.path.basename(f) for f in files]
+    assert names(index.files_in_range()) == ["log_a.csv", "log_b.csv", "log_c.csv"]
+    assert names(index.files_in_range(T0 + 3650, T0 + 3660)) == ["log_b.csv"]
+    assert names(index.files_in_range(T0 + 50, T0 + 3650)) == ["log_a.csv", "log_b.csv"]
+    assert names(index.files_in_range(T0 + 200, T0 + 300)) == []
+    assert os.path.exists(tmp_path / "log_index.json")
+
+    # 檔案變更後重新掃描，未變更的檔案沿用索引
+    _write_log(tmp_path / "log_c.csv", T0 + 20000, 10)
+    assert index.refresh()["log_c.csv"]["start"] == T0 + 20000
+    assert index.refresh()["log_a.csv"]["rows"] == 100
+
+    stats = LogAnalyzer(str(tmp_path), chunksize=30).analyze(start=T0 + 3600, end=T0 + 3699)
+    s = stats.summary()["x"]
+    assert s["count"] == 100 and s["bias"] == pytest.approx(5.0)
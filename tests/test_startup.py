@@ -0,0 +1,74 @@
+import glob
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORT_BUDGET = 0.5  # 秒；目前約 60 ms，預留給較慢的機器
+STARTUP_BUDGET = 0.5  # 秒；匯入加上建立控制器（顯示選單前），目前約 80 ms
+HEAVY_MODULES = ("pandas", "numpy", "scipy", "nidaqmx")
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter() - start
+if %(construct)r:
+    main.MagneticFieldController()
+elapsed = time.perf_counter() - start
+print(json.dumps({"imported": imported, "elapsed": elapsed,
+                  "loaded": [m for m in %(heavy)r if m in sys.modules]}))
+"""
+
+
+def _copy_repo(tmp_path, config):
+    """複製程式到暫存資料夾並寫入測試用的 config.json，避免動到實際的設定與日誌"""
+    for path in glob.glob(os.path.join(REPO_DIR, "*.py")):
+        shutil.copy(path, tmp_path)
+    os.makedirs(tmp_path / "data", exist_ok=True)
+    (tmp_path / "config.json").write_text(json.dumps(config), encoding="utf-8")
+    return tmp_path
+
+
+def _probe(cwd, construct=False):
+    code = PROBE % {"construct": construct, "heavy": HEAVY_MODULES}
+    result = subprocess.run([sys.executable, "-c", code], cwd=cwd,
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_import_main_does_not_load_heavy_modules():
+    assert _probe(REPO_DIR)["loaded"] == []
+
+
+def test_import_main_within_budget():
+    # 取多次中的最小值，排除冷快取與系統負載的影響
+    elapsed = min(_probe(REPO_DIR)["imported"] for _ in range(3))
+    assert elapsed < IMPORT_BUDGET, f"import main 花費 {elapsed * 1000:.0f} ms"
+
+
+@pytest.mark.parametrize("config", [
+    {},
+    {"transforms": [{"type": "scale", "gain": [1.0, 2.0, 1.0]},
+                    {"type": "lowpass", "cutoff": 0.1, "sample_rate": 1.0},
+                    {"type": "rotate", "euler_deg": [0, 0, 90]}]},
+], ids=["default", "transforms"])
+def test_controller_startup_within_budget(tmp_path, config):
+    cwd = _copy_repo(tmp_path, config)
+    results = [_probe(cwd, construct=True) for _ in range(3)]
+    assert results[-1]["loaded"] == []
+    elapsed = min(result["elapsed"] for result in results)
+    assert elapsed < STARTUP_BUDGET, f"啟動至選單花費 {elapsed * 1000:.0f} ms"
+
+
+def test_prompt_is_available_while_data_file_loads(tmp_path):
+    cwd = _copy_repo(tmp_path, {"csv_input": "big.csv"})
+    subprocess.run([sys.executable, "data_generator.py", "data/big.csv", "--rows", "200000"],
+                   cwd=cwd, check=True, capture_output=True)
+    result = subprocess.run([sys.executable, "main.py"], cwd=cwd, input="status\nstop\n",
+                            capture_output=True, text=True, timeout=60)
+    assert "狀態：資料載入中" in result.stdout
@@ -0,0 +1,62 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+import transform_pipeline
+from transform_pipeline import TransformPipeline, TransformStage
+
+CONFIG = [
+    {"type": "baseline", "time_constant": 20},
+    {"type": "scale", "gain": [1.0, 2.0, 0.5], "offset": [10.0, 0.0, -5.0]},
+    {"type": "lowpass", "cutoff": 0.05, "sample_rate": 1.0},
+    {"type": "rotate", "euler_deg": [10.0, -20.0, 30.0]},
+]
+
+
+def _field(rows=250):
+    rng = np.random.default_rng(4)
+    values = np.cumsum(rng.normal(0.0, 5.0, size=(rows, 3)), axis=0) + [20000.0, 0.0, 40000.0]
+    return pd.DataFrame(values, columns=["Bx", "By", "Bz"])
+
+
+@pytest.mark.parametrize("scipy", [True, False], ids=["scipy", "numpy"])
+@pytest.mark.parametrize("chunksize", [1, 7, 64, 100000])
+def test_apply_batch_matches_row_by_row_processing(monkeypatch, scipy, chunksize):
+    if scipy:
+        pytest.importorskip("scipy")
+    transform_pipeline._import_numeric_modules()
+    if not scipy:
+        monkeypatch.setattr(transform_pipeline, "lfilter", None)
+    df = _field()
+    pipeline = TransformPipeline.from_config(CONFIG)
+
+    batch = pipeline.apply_batch(df, chunksize=chunksize)
+    pipeline.reset()
+    rows = [pipeline.process_row(*values) for values in df[["Bx", "By", "Bz"]].to_numpy()]
+    np.testing.assert_allclose(batch[["Bx", "By", "Bz"]].to_numpy(), rows, rtol=1e-9, atol=1e-6)
+
+
+def test_rotation_matrix_from_euler_angles():
+    pipeline = TransformPipeline.from_config([{"type": "rotate", "euler_deg": [0, 0, 90]}])
+    np.testing.assert_allclose(pipeline.process_row(1.0, 0.0, 0.0), (0.0, 1.0, 0.0), atol=1e-12)
+
+
+@pytest.mark.parametrize("entry", [
+    {"type": "scale", "gain": [1.0, 2.0]},
+    {"type": "rotate", "matrix": [[1, 0, 0], [0, 1, 0]]},
+    {"type": "lowpass", "cutoff": 0.6, "sample_rate": 1.0},
+    {"type": "lowpass", "cutoff": 0.1},
+    {"type": "unknown"},
+])
+def test_invalid_config_is_rejected(entry):
+    with pytest.raises(ValueError):
+        TransformPipeline.from_config([entry])
+
+
+def test_stage_must_implement_process():
+    class Incomplete(TransformStage):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -0,0 +1,242 @@
+import abc
+import math
+from typing import Dict, List, Optional, Sequence, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy
+    import pandas as pd
+
+# numpy 與 scipy 匯入耗時，建立流程時只驗證設定，第一次處理資料時才載入
+np = None
+lfilter = None
+
+FIELD_COLUMNS = ['Bx', 'By', 'Bz']
+Vector = Tuple[float, float, float]
+
+
+def _import_numeric_modules():
+    global np, lfilter
+    if np is None:
+        import numpy
+        try:
+            from scipy.signal import lfilter as _lfilter
+        except ImportError:
+            _lfilter = None
+        lfilter = _lfilter
+        np = numpy
+
+
+def _vector(name: str, values: Sequence[float]) -> Vector:
+    """驗證三軸參數並轉為 float"""
+    values = tuple(float(value) for value in values)
+    if len(values) != 3:
+        raise ValueError(f"{name} 必須為三軸的值")
+    return values
+
+
+def _matmul(a: Sequence[Sequence[float]], b: Sequence[Sequence[float]]) -> List[List[float]]:
+    return [[sum(a[i][k] * b[k][j] for k in range(3)) for j in range(3)] for i in range(3)]
+
+
+class TransformStage(abc.ABC):
+    """轉換階段的基底類別：輸入與輸出皆為形狀 (n, 3) 的陣列，濾波狀態在區塊之間保留
+
+    建構時只做純 Python 的參數驗證；process 被呼叫時 numpy 已由 TransformPipeline 載入。
+    """
+
+    stateful = False  # 輸出是否取決於先前的資料
+
+    @abc.abstractmethod
+    def process(self, chunk: 'numpy.ndarray') -> 'numpy.ndarray':
+        """處理一個區塊並更新濾波狀態"""
+
+    def reset(self):
+        pass
+
+
+class BaselineStage(TransformStage):
+    """扣除基準值：固定的 values，或以 time_constant（筆數）的指數平均追蹤緩慢變化的基準"""
+
+    def __init__(self, values: Optional[Sequence[float]] = None, time_constant: Optional[float] = None):
+        if (values is None) == (time_constant is None):
+            raise ValueError("baseline 需指定 values 或 time_constant 其中之一")
+        self.values = None if values is None else _vector("baseline 的 values", values)
+        self.alpha = None if time_constant is None else 1.0 / max(float(time_constant), 1.0)
+        self.stateful = time_constant is not None
+        self._mean: Optional['numpy.ndarray'] = None
+
+    def reset(self):
+        self._mean = None
+
+    def process(self, chunk: 'numpy.ndarray') -> 'numpy.ndarray':
+        if self.values is not None:
+            return chunk - self.values
+        if self._mean is None:
+            self._mean = chunk[0].copy()
+        baseline = _first_order(chunk, self._mean, self.alpha)
+        self._mean = baseline[-1]
+        return chunk - baseline
+
+
+class ScaleStage(TransformStage):
+    """每軸乘上 gain 再加上 offset"""
+
+    def __init__(self, gain: Sequence[float] = (1.0, 1.0, 1.0), offset: Sequence[float] = (0.0, 0.0, 0.0)):
+        self.gain = _vector("scale 的 gain", gain)
+        self.offset = _vector("scale 的 offset", offset)
+
+    def process(self, chunk: 'numpy.ndarray') -> 'numpy.ndarray':
+        return chunk * self.gain + self.offset
+
+
+class LowPassStage(TransformStage):
+    """二階 Butterworth 低通濾波（雙線性轉換），cutoff 與 sample_rate 單位為 Hz
+
+    sample_rate 為資料本身的取樣率（例如每分鐘一筆為 1/60），不是輸出間隔，因此必須明確指定。
+    第一筆資料時將濾波狀態初始化為穩態，避免從零開始的暫態。
+    """
+
+    stateful = True
+
+    def __init__(self, cutoff: float, sample_rate: float):
+        if not 0 < cutoff < sample_rate / 2:
+            raise ValueError("lowpass 的 cutoff 必須介於 0 與 sample_rate / 2 之間")
+        k = math.tan(math.pi * cutoff / sample_rate)
+        norm = 1.0 / (1.0 + math.sqrt(2) * k + k * k)
+        b0 = k * k * norm
+        self.b = (b0, 2 * b0, b0)
+        self.a = (1.0, 2 * (k * k - 1) * norm, (1 - math.sqrt(2) * k + k * k) * norm)
+        self._state: Optional['numpy.ndarray'] = None
+
+    def reset(self):
+        self._state = None
+
+    def process(self, chunk: 'numpy.ndarray') -> 'numpy.ndarray':
+        b, a = self.b, self.a
+        if self._state is None:
+            x0 = chunk[0]
+            self._state = np.vstack([x0 * (1 - b[0]), x0 * (b[2] - a[2])])
+        if lfilter is not None:
+            out, self._state = lfilter(b, a, chunk, axis=0, zi=self._state)
+            return out
+        # 沒有 scipy 時逐筆計算（直接型 II 轉置）
+        out = np.empty_like(chunk, dtype=float)
+        z1, z2 = self._state[0].copy(), self._state[1].copy()
+        for i, x in enumerate(chunk):
+            y = b[0] * x + z1
+            z1 = b[1] * x - a[1] * y + z2
+            z2 = b[2] * x - a[2] * y
+            out[i] = y
+        self._state = np.vstack([z1, z2])
+        return out
+
+
+class RotationStage(TransformStage):
+    """將資料旋轉到線圈座標：直接指定 3x3 matrix，或以 euler_deg [x, y, z] 依 x、y、z 順序旋轉"""
+
+    def __init__(self, matrix: Optional[Sequence[Sequence[float]]] = None,
+                 euler_deg: Optional[Sequence[float]] = None):
+        if (matrix is None) == (euler_deg is None):
+            raise ValueError("rotate 需指定 matrix 或 euler_deg 其中之一")
+        if matrix is not None:
+            if len(matrix) != 3:
+                raise ValueError("rotate 的 matrix 必須為 3x3")
+            self.matrix = [list(_vector("rotate 的 matrix 每一列", row)) for row in matrix]
+        else:
+            rx, ry, rz = (math.radians(angle) for angle in _vector("rotate 的 euler_deg", euler_deg))
+            cx, sx, cy, sy, cz, sz = math.cos(rx), math.sin(rx), math.cos(ry), math.sin(ry), math.cos(rz), math.sin(rz)
+            x = [[1, 0, 0], [0, cx, -sx], [0, sx, cx]]
+            y = [[cy, 0, sy], [0, 1, 0], [-sy, 0, cy]]
+            z = [[cz, -sz, 0], [sz, cz, 0], [0, 0, 1]]
+            self.matrix = _matmul(z, _matmul(y, x))
+        self._transposed: Optional['numpy.ndarray'] = None
+
+    def process(self, chunk: 'numpy.ndarray') -> 'numpy.ndarray':
+        if self._transposed is None:
+            self._transposed = np.array(self.matrix).T
+        return chunk @ self._transposed
+
+
+def _first_order(chunk: 'numpy.ndarray', initial: 'numpy.ndarray', alpha: float) -> 'numpy.ndarray':
+    """一階指數平均 y[n] = y[n-1] + alpha * (x[n] - y[n-1])，回傳每筆的 y"""
+    if lfilter is not None:
+        out, _ = lfilter([alpha], [1.0, alpha - 1.0], chunk, axis=0, zi=((1 - alpha) * initial)[None, :])
+        return out
+    out = np.empty_like(chunk, dtype=float)
+    y = initial.copy()
+    for i, x in enumerate(chunk):
+        y = y + alpha * (x - y)
+        out[i] = y
+    return out
+
+
+STAGES = {
+    "baseline": BaselineStage,
+    "scale": ScaleStage,
+    "lowpass": LowPassStage,
+    "rotate": RotationStage,
+}
+
+
+class TransformPipeline:
+    """DataLoader 與電壓轉換之間的轉換流程
+
+    同一組階段可用 apply_batch 對整份資料分塊處理，也可用 process / process_row
+    在串流模式下逐段處理；兩者因狀態在區塊之間延續而得到相同結果。
+    """
+
+    def __init__(self, stages: List[TransformStage]):
+        self.stages = stages
+
+    @classmethod
+    def from_config(cls, config: List[Dict]) -> 'TransformPipeline':
+        """由 config.json 的 transforms 建立，例如 [{"type": "lowpass", "cutoff": 0.01, "sample_rate": 1.0}]"""
+        stages = []
+        for entry in config:
+            params = dict(entry)
+            stage_type = params.pop("type", None)
+            if stage_type not in STAGES:
+                raise ValueError(f"未知的轉換類型: {stage_type}")
+            try:
+                stages.append(STAGES[stage_type](**params))
+            except TypeError as e:
+                raise ValueError(f"{stage_type} 的參數錯誤: {e}")
+        return cls(stages)
+
+    @property
+    def stateful(self) -> bool:
+        """是否有階段依賴先前的資料；沒有時可從檔案中段開始處理"""
+        return any(stage.stateful for stage in self.stages)
+
+    def prepare(self):
+        """預先載入 numpy 與 scipy，讓第一筆資料的轉換不需等待匯入"""
+        _import_numeric_modules()
+
+    def reset(self):
+        for stage in self.stages:
+            stage.reset()
+
+    def process(self, chunk: 'numpy.ndarray') -> 'numpy.ndarray':
+        _import_numeric_modules()
+        chunk = np.asarray(chunk, dtype=float)
+        if len(chunk) == 0:
+            return chunk
+        for stage in self.stages:
+            chunk = stage.process(chunk)
+        return chunk
+
+    def process_row(self, bx: float, by: float, bz: float) -> Tuple[float, float, float]:
+        out = self.process([[bx, by, bz]])[0]
+        return float(out[0]), float(out[1]), float(out[2])
+
+    def apply_batch(self, df: 'pd.DataFrame', chunksize: int = 100000) -> 'pd.DataFrame':
+        """從初始狀態分塊處理整份資料，回傳替換 Bx, By, Bz 後的副本"""
+        _import_numeric_modules()
+        self.reset()
+        values = df[FIELD_COLUMNS].to_numpy(dtype=float)
+        out = np.empty_like(values)
+        for start in range(0, len(values), chunksize):
+            out[start:start + chunksize] = self.process(values[start:start + chunksize])
+        df = df.copy()
+        df[FIELD_COLUMNS] = out
+        return df